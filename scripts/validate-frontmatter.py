@@ -17,41 +17,103 @@ Checks:
     10. Skill branch_prefix values appear in CLAUDE.md Rule 1
 """
 
-import glob
 import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 import yaml
 
+try:
+    # libyaml-backed loader — much faster, same safe-load semantics
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 ERRORS: list[str] = []
 
+# Compiled once at module scope — these run inside per-file/per-value loops
+_RULE0_RE = re.compile(r"outside a defined skill \((/[a-z, /-]+)\)")
+_RULE1_RE = re.compile(r"Branch naming:\s*(.+)")
+_PFX_RE = re.compile(r"`(\w+)/<")
+_GITLEAKS_RE = re.compile(r"'''(.+?)'''")
+
 
 def error(msg: str) -> None:
     ERRORS.append(msg)
     print(f"FAIL: {msg}", file=sys.stderr)
 
 
+# Frontmatter blocks are small; reading this much almost always covers the
+# closing fence without pulling the whole document into memory
+_FM_HEAD_BYTES = 16384
+
+
 def parse_frontmatter(filepath: str) -> dict | None:
     """Extract YAML frontmatter from a markdown file."""
     with open(filepath) as f:
-        content = f.read()
-    m = re.match(r"^---\n(.*?\n)---", content, re.DOTALL)
-    if not m:
-        return None
-    return yaml.safe_load(m.group(1))
+        content = f.read(_FM_HEAD_BYTES)
+        # Locate the closing fence with plain string scans instead of a DOTALL
+        # regex — same result, no regex-engine pass over the whole file.
+        if not content.startswith("---\n"):
+            return None
+        end = content.find("\n---", 4)
+        if end == -1:
+            # Closing fence beyond the prefix (rare) — fall back to a full read
+            content += f.read()
+            end = content.find("\n---", 4)
+            if end == -1:
+                return None
+    return yaml.load(content[4 : end + 1], Loader=SafeLoader)
+
+
+def parse_all_frontmatter(files: list[str]) -> dict[str, dict | None]:
+    """Parse frontmatter for many files, overlapping I/O with a thread pool.
+
+    Threads release the GIL during file reads (and inside libyaml), so
+    parsing overlaps disk latency. Small batches stay serial — the pool
+    costs more than it saves below a handful of files.
+    """
+    if len(files) < 16:
+        return {f: parse_frontmatter(f) for f in files}
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        return dict(zip(files, ex.map(parse_frontmatter, files)))
 
 
 # ---------------------------------------------------------------------------
 # Collect files
 # ---------------------------------------------------------------------------
 
-stack_files = sorted(
-    f
-    for f in glob.glob(".claude/stacks/**/*.md", recursive=True)
-    if "TEMPLATE" not in f
-)
-skill_files = sorted(glob.glob(".claude/commands/*.md"))
+
+def _walk_md(root):
+    """Yield .md files under root recursively, skipping TEMPLATE files.
+
+    os.scandir-based: filters during the walk and reuses the dirent type
+    instead of glob's build-everything-then-filter (one stat per entry).
+    """
+    try:
+        entries = os.scandir(root)
+    except FileNotFoundError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk_md(entry.path)
+            elif entry.name.endswith(".md") and "TEMPLATE" not in entry.name:
+                yield entry.path
+
+
+stack_files = sorted(_walk_md(".claude/stacks"))
+# Skills are a flat directory with no TEMPLATE file — list it directly so
+# the set of skill files matches validate-semantics.py exactly
+skill_files: list[str] = []
+try:
+    with os.scandir(".claude/commands") as _it:
+        skill_files = sorted(
+            e.path for e in _it if e.is_file() and e.name.endswith(".md")
+        )
+except FileNotFoundError:
+    pass
 
 STACK_REQUIRED_KEYS = [
     "assumes",
@@ -77,8 +139,7 @@ SKILL_REQUIRED_KEYS = [
 # ---------------------------------------------------------------------------
 
 stack_data: dict[str, dict] = {}
-for sf in stack_files:
-    data = parse_frontmatter(sf)
+for sf, data in parse_all_frontmatter(stack_files).items():
     if data is None:
         error(f"[1] {sf}: missing frontmatter")
         continue
@@ -91,10 +152,13 @@ for sf in stack_files:
 # Check 2: Every assumes entry resolves to an existing stack file
 # ---------------------------------------------------------------------------
 
+# The walk in "Collect files" already saw every stack file — membership in
+# that set answers existence without a stat; only unknown paths hit the disk
+stack_paths = set(stack_files)
 for sf, data in stack_data.items():
-    for dep in data.get("assumes", []):
+    for dep in data.get("assumes") or ():
         dep_path = f".claude/stacks/{dep}.md"
-        if not os.path.isfile(dep_path):
+        if dep_path not in stack_paths and not os.path.isfile(dep_path):
             error(f"[2] {sf}: assumes '{dep}' but {dep_path} does not exist")
 
 # ---------------------------------------------------------------------------
@@ -102,11 +166,14 @@ for sf, data in stack_data.items():
 # ---------------------------------------------------------------------------
 
 skill_data: dict[str, dict] = {}
-for sf in skill_files:
-    data = parse_frontmatter(sf)
+for sf, data in parse_all_frontmatter(skill_files).items():
     if data is None:
         error(f"[3] {sf}: missing frontmatter")
         continue
+    # Precompute once here — checks 5 & 6 test membership against this
+    data["_ref_basenames"] = frozenset(
+        os.path.basename(r) for r in data.get("references") or ()
+    )
     skill_data[sf] = data
     for key in SKILL_REQUIRED_KEYS:
         if key not in data:
@@ -116,32 +183,48 @@ for sf in skill_files:
 # Check 4: Every references file path exists on disk
 # ---------------------------------------------------------------------------
 
+# One directory listing per unique parent instead of one stat per reference —
+# many skills reference files in the same directory (e.g. .claude/patterns/).
+_dir_entries: dict[str, set[str]] = {}
+
+
+def _ref_exists(path: str) -> bool:
+    dirname, basename = os.path.split(path)
+    if not basename:
+        return os.path.exists(path)
+    dirname = dirname or "."
+    entries = _dir_entries.get(dirname)
+    if entries is None:
+        try:
+            entries = set(os.listdir(dirname))
+        except OSError:
+            entries = set()
+        _dir_entries[dirname] = entries
+    return basename in entries
+
+
 for sf, data in skill_data.items():
-    for ref in data.get("references", []):
-        if not os.path.exists(ref):
+    for ref in data.get("references") or ():
+        if not _ref_exists(ref):
             error(f"[4] {sf}: references '{ref}' but file does not exist")
 
 # ---------------------------------------------------------------------------
-# Check 5: code-writing skills must reference verify.md
+# Checks 5 & 6: code-writing skills must reference verify.md and branch.md
 # ---------------------------------------------------------------------------
 
-for sf, data in skill_data.items():
-    if data.get("type") != "code-writing":
-        continue
-    refs = data.get("references", [])
-    ref_basenames = [os.path.basename(r) for r in refs]
+# Filtered once here — any future type-gated check can reuse this index
+code_writing_skills = [
+    (sf, data)
+    for sf, data in skill_data.items()
+    if data.get("type") == "code-writing"
+]
+
+# Single pass: both checks test membership in the _ref_basenames frozenset
+# precomputed during check 3.
+for sf, data in code_writing_skills:
+    ref_basenames = data["_ref_basenames"]
     if "verify.md" not in ref_basenames:
         error(f"[5] {sf}: code-writing skill missing verify.md in references")
-
-# ---------------------------------------------------------------------------
-# Check 6: code-writing skills must reference branch.md
-# ---------------------------------------------------------------------------
-
-for sf, data in skill_data.items():
-    if data.get("type") != "code-writing":
-        continue
-    refs = data.get("references", [])
-    ref_basenames = [os.path.basename(r) for r in refs]
     if "branch.md" not in ref_basenames:
         error(f"[6] {sf}: code-writing skill missing branch.md in references")
 
@@ -149,24 +232,26 @@ for sf, data in skill_data.items():
 # Check 7: CLAUDE.md Rule 0 parenthetical skill list matches actual filenames
 # ---------------------------------------------------------------------------
 
-if os.path.isfile("CLAUDE.md"):
+try:
     with open("CLAUDE.md") as f:
         claude_content = f.read()
+except FileNotFoundError:
+    claude_content = None
+
+if claude_content is not None:
     # Match the parenthetical list in Rule 0: (/bootstrap, /change, /iterate)
-    m = re.search(
-        r"outside a defined skill \((/[a-z, /-]+)\)", claude_content
-    )
+    m = _RULE0_RE.search(claude_content)
     if m:
-        claude_skills = sorted(
-            s.strip().lstrip("/") for s in m.group(1).split(",")
-        )
-        actual_skills = sorted(
+        claude_skills = [s.strip().lstrip("/") for s in m.group(1).split(",")]
+        actual_skills = [
             os.path.basename(f).replace(".md", "") for f in skill_files
-        )
-        if claude_skills != actual_skills:
+        ]
+        # List comparison, not sets — a duplicated entry in the Rule 0
+        # parenthetical must still be flagged
+        if sorted(claude_skills) != sorted(actual_skills):
             error(
                 f"[7] CLAUDE.md Rule 0 skill list mismatch: "
-                f"claude.md={claude_skills} vs actual={actual_skills}"
+                f"claude.md={sorted(claude_skills)} vs actual={sorted(actual_skills)}"
             )
     else:
         error("[7] Could not find Rule 0 skill list pattern in CLAUDE.md")
@@ -175,17 +260,12 @@ if os.path.isfile("CLAUDE.md"):
 # Check 10: Skill branch_prefix values appear in CLAUDE.md Rule 1
 # ---------------------------------------------------------------------------
 
-if os.path.isfile("CLAUDE.md"):
-    with open("CLAUDE.md") as f:
-        claude_content_r1 = f.read()
+# Reuses the CLAUDE.md content already read for Check 7
+if claude_content is not None:
     # Match Rule 1 branch naming line: `feat/<topic>`, `fix/<topic>`, etc.
-    r1_match = re.search(
-        r"Branch naming:\s*(.+)", claude_content_r1
-    )
+    r1_match = _RULE1_RE.search(claude_content)
     if r1_match:
-        allowed_prefixes = set(
-            re.findall(r"`(\w+)/<", r1_match.group(1))
-        )
+        allowed_prefixes = set(_PFX_RE.findall(r1_match.group(1)))
         for sf, data in skill_data.items():
             prefix = data.get("branch_prefix", "")
             if prefix and prefix not in allowed_prefixes:
@@ -201,17 +281,33 @@ if os.path.isfile("CLAUDE.md"):
 # ---------------------------------------------------------------------------
 
 ci_yml_path = ".github/workflows/ci.yml"
-if os.path.isfile(ci_yml_path):
+try:
     with open(ci_yml_path) as f:
         ci_content = f.read()
+except FileNotFoundError:
+    ci_content = None
 
+if ci_content is not None:
     all_placeholder_keys: set[str] = set()
     for _sf, data in stack_data.items():
-        for key in data.get("ci_placeholders", {}):
+        for key in data.get("ci_placeholders") or ():
             all_placeholder_keys.add(key)
 
-    for key in sorted(all_placeholder_keys):
-        if key not in ci_content:
+    # One findall pass over ci.yml instead of a substring scan per key.
+    # Longest-first alternation so keys that prefix other keys still match;
+    # the per-key substring fallback covers keys the non-overlapping
+    # findall pass consumed as part of a longer hit.
+    if all_placeholder_keys:
+        key_re = re.compile(
+            "|".join(
+                re.escape(k)
+                for k in sorted(all_placeholder_keys, key=len, reverse=True)
+            )
+        )
+        present = set(key_re.findall(ci_content))
+        for key in sorted(all_placeholder_keys - present):
+            if key in ci_content:
+                continue
             error(f"[8] ci_placeholders key '{key}' not found in {ci_yml_path}")
 
 # ---------------------------------------------------------------------------
@@ -219,35 +315,58 @@ if os.path.isfile(ci_yml_path):
 # ---------------------------------------------------------------------------
 
 gitleaks_path = ".gitleaks.toml"
-if os.path.isfile(gitleaks_path):
+try:
     with open(gitleaks_path) as f:
         gitleaks_content = f.read()
-    # Extract regex patterns from the allowlist
-    gitleaks_patterns = re.findall(r"'''(.+?)'''", gitleaks_content)
+except FileNotFoundError:
+    gitleaks_content = None
+
+if gitleaks_content is not None:
+    # Extract regex patterns from the allowlist and compile each one once,
+    # dropping any that don't compile (instead of try/except per value)
+    gitleaks_patterns = []
+    for pattern in _GITLEAKS_RE.findall(gitleaks_content):
+        try:
+            gitleaks_patterns.append(re.compile(pattern))
+        except re.error:
+            pass
 
     all_placeholder_values: set[str] = set()
     for _sf, data in stack_data.items():
-        for val in data.get("ci_placeholders", {}).values():
+        for val in (data.get("ci_placeholders") or {}).values():
             str_val = str(val)
             # Skip URLs — gitleaks won't flag them as secrets
             if str_val.startswith("https://") or str_val.startswith("http://"):
                 continue
             all_placeholder_values.add(str_val)
 
-    for val in sorted(all_placeholder_values):
-        matched = False
-        for pattern in gitleaks_patterns:
-            try:
-                if re.search(pattern, val):
-                    matched = True
-                    break
-            except re.error:
-                pass
-        if not matched:
-            error(
-                f"[9] ci_placeholder value '{val}' not matched by any "
-                f".gitleaks.toml allowlist pattern"
+    # One alternation over all allowlist patterns: a single search per value
+    # instead of a Python-level loop over every pattern
+    combined = None
+    if gitleaks_patterns:
+        try:
+            combined = re.compile(
+                "|".join(f"(?:{p.pattern})" for p in gitleaks_patterns)
             )
+        except re.error:
+            combined = None  # e.g. duplicate group names — use per-pattern search
+
+    # Sort only the failures (for stable output) — the common all-matched
+    # path never pays for a sort
+    unmatched_values = [
+        val
+        for val in all_placeholder_values
+        if not (
+            combined.search(val)
+            if combined is not None
+            else any(pattern.search(val) for pattern in gitleaks_patterns)
+        )
+    ]
+    for val in sorted(unmatched_values):
+        error(
+            f"[9] ci_placeholder value '{val}' not matched by any "
+            f".gitleaks.toml allowlist pattern"
+        )
 
 # ---------------------------------------------------------------------------
 # Summary
@@ -9,18 +9,49 @@ Exit codes:
 """
 
 import os
-import re
+import string
 import sys
 
 import yaml
 
+try:
+    # libyaml-backed loader — much faster, same safe-load semantics
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
-data = yaml.safe_load(open("idea/idea.yaml"))
+
+data = yaml.load(open("idea/idea.yaml"), Loader=SafeLoader)
 warnings = False
 
+_fm_cache: dict[str, dict | None] = {}
+
+
+def load_fm(path: str) -> dict | None:
+    """Parse and cache YAML frontmatter; None if missing file or no fence."""
+    if path not in _fm_cache:
+        fm = None
+        try:
+            with open(path) as f:
+                content = f.read()
+        except FileNotFoundError:
+            content = None
+        if content is not None and content.startswith("---\n"):
+            end = content.find("\n---", 4)
+            if end != -1:
+                fm = yaml.load(content[4 : end + 1], Loader=SafeLoader)
+        _fm_cache[path] = fm
+    return _fm_cache[path]
+
 # --- Name format ---
+# Plain string checks — equivalent to re.fullmatch(r"[a-z][a-z0-9-]*", name)
+_ALLOWED_NAME_CHARS = set(string.ascii_lowercase + string.digits + "-")
 name = data.get("name", "")
-if not re.fullmatch(r"[a-z][a-z0-9-]*", name):
+if not (
+    name
+    and name[0] in string.ascii_lowercase
+    and set(name) <= _ALLOWED_NAME_CHARS
+):
     print(
         f'Error: name "{name}" must be lowercase, start with a letter, '
         "and use only a-z, 0-9, hyphens."
@@ -29,7 +60,7 @@ if not re.fullmatch(r"[a-z][a-z0-9-]*", name):
     sys.exit(1)
 
 # --- Landing page ---
-pages = data.get("pages", [])
+pages = data.get("pages") or ()
 if not any(p.get("name") == "landing" for p in pages):
     print("Error: pages must include an entry with name: landing")
     print("Add a landing page to the pages list in idea.yaml.")
@@ -70,16 +101,8 @@ if stack_warnings:
 # --- Stack assumes consistency ---
 assumes_warnings = []
 for cat, val in stack.items():
-    sf = f".claude/stacks/{cat}/{val}.md"
-    if not os.path.isfile(sf):
-        continue
-    with open(sf) as f:
-        content = f.read()
-    m = re.match(r"^---\n(.*?\n)---", content, re.DOTALL)
-    if not m:
-        continue
-    fm = yaml.safe_load(m.group(1)) or {}
-    for assume in fm.get("assumes") or []:
+    fm = load_fm(f".claude/stacks/{cat}/{val}.md") or {}
+    for assume in fm.get("assumes") or ():
         parts = assume.split("/")
         if len(parts) != 2:
             continue
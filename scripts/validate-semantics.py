@@ -47,29 +47,235 @@ Checks:
   43. Distribute Skill Validates EVENTS.yaml custom_events Structure — distribute.md preconditions validate custom_events is a list
 """
 
-import glob
+import atexit
+import bisect
 import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 
 import yaml
 
+try:
+    # libyaml-backed loader — much faster, same safe-load semantics
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 ERRORS: list[str] = []
+_ERRORS_FLUSHED = False
 
 
 def error(msg: str) -> None:
+    """Record a failure; messages are written to stderr in one batch."""
     ERRORS.append(msg)
-    print(f"FAIL: {msg}", file=sys.stderr)
 
 
-def parse_frontmatter(filepath: str) -> dict | None:
-    """Extract YAML frontmatter from a markdown file."""
-    with open(filepath) as f:
-        content = f.read()
-    m = re.match(r"^---\n(.*?\n)---", content, re.DOTALL)
-    if not m:
+def _flush_errors() -> None:
+    """Write all recorded failures to stderr in a single call.
+
+    Also registered with atexit so a mid-run exception still reports the
+    failures collected up to that point.
+    """
+    global _ERRORS_FLUSHED
+    if ERRORS and not _ERRORS_FLUSHED:
+        _ERRORS_FLUSHED = True
+        # One sort here keeps the output deterministic so the per-file
+        # checks can iterate sets directly
+        ERRORS.sort()
+        sys.stderr.write("".join(f"FAIL: {m}\n" for m in ERRORS))
+        sys.stderr.flush()
+
+
+atexit.register(_flush_errors)
+
+
+# ---------------------------------------------------------------------------
+# Compiled once at module scope — these all run inside per-file or per-block
+# loops below
+# ---------------------------------------------------------------------------
+
+_CODE_BLOCK_RE = re.compile(r"^```(\w+)?\s*\n(.*?)^```", re.MULTILINE | re.DOTALL)
+_PROSE_STRIP_RE = re.compile(r"```\w*\s*\n.*?```", re.MULTILINE | re.DOTALL)
+# JSX component usage and import statements matched in one scan per block —
+# dispatch on which named group hit
+_JSX_AND_IMPORT_RE = re.compile(
+    r"<(?P<jsx>[A-Z][a-zA-Z]+)|"
+    r"import\s+(?:type\s+)?(?:\{(?P<named>[^}]+)\}|(?P<default>\w+))\s+from"
+)
+# Yields the aliased-or-original name from a named-import group in one pass:
+# "Foo, Bar as Baz" -> ["Foo", "Baz"]
+_NAMED_IMPORT_RE = re.compile(r"(?:\w+\s+as\s+)?(\w+)")
+_NPM_RE = re.compile(r"\bnpm\b|\bnpx\b|\bnode\b")
+_PKG_GUARD_RE = re.compile(
+    r"if\s+\[.*package\.json|test\s+-f\s+package\.json|"
+    r"-f\s+package\.json|-e\s+package\.json"
+)
+_IDEA_NAME_RE = re.compile(r"^[a-z][a-z0-9-]*$")
+_HEADER_RE = re.compile(r"###\s+`([^`]+)`")
+_CLEAN_TAG_RE = re.compile(r"#\s+(\w+/\w+)\s*$")
+_RM_RE = re.compile(r"rm\s+(?:-rf|-f)\s+(.*)")
+_STACK_FILE_REF_RE = re.compile(r"from the (\w+) stack file")
+_TOOL_REF_RE = re.compile(r"using the (\w+) tool")
+_ENV_LOADER_RE = re.compile(r"loadEnvConfig|dotenv|@next/env")
+_EG_RE = re.compile(r"e\.g\.\s*,")
+_NOT_BRANCH_RE = re.compile(r"(?i)when\s+`?stack\.(\w+)`?\s+is\s+NOT\s+(\w+)")
+
+# Makefile checks (2, 4b, 6, 10, 15, 20)
+# The name class has no "." — special targets like .PHONY never match
+_MK_TARGET_RE = re.compile(r"^([a-zA-Z0-9_-]+)\s*:(?!=)", re.MULTILINE)
+_MK_CLEAN_RE = re.compile(r"^clean:.*?\n((?:\t.*\n)*)", re.MULTILINE)
+_MK_REQUIRED_RE = re.compile(r"required\s*=\s*\[([^\]]+)\]")
+_VALIDATE_WARN_RE = re.compile(r"(?i)WARN|warning.*if|if.*warn")
+_PROVIDER_CMD_RES = {
+    "vercel": re.compile(r"\bvercel\b"),
+    "netlify": re.compile(r"\bnetlify\b"),
+    "fly": re.compile(r"\bfly\b|\bflyctl\b"),
+}
+_HOSTING_GUARD_RE = re.compile(r"(?:HOSTING|hosting|stack.*hosting)")
+_MK_HELP_RE = re.compile(r"^([a-zA-Z0-9_-]+):\s*.*?##\s*(.+)$", re.MULTILINE)
+_HELP_ENV_VAR_RE = re.compile(
+    r"\b(?:NEXT_PUBLIC_[A-Z_]+|"
+    r"[A-Z][A-Z_]{3,}(?:_KEY|_URL|_ID|_SECRET|_TOKEN|_ANON_KEY|_ROLE_KEY))\b"
+)
+# Substring prefilter for the pattern above — most help lines contain none
+# of these, and a literal scan is far cheaper than a regex attempt
+_ENV_VAR_HINTS = (
+    "_KEY", "_URL", "_ID", "_SECRET", "_TOKEN", "NEXT_PUBLIC_",
+)
+
+# bootstrap.md checks (7, 22)
+_BOOTSTRAP_ALWAYS_RE = re.compile(r"always:\s*([^;)]+?)(?:\)|;|$)")
+_BOOTSTRAP_VALIDATE_SECTION_RE = re.compile(
+    r"(?:###?\s*|\d+\.\s*(?:\*\*)?)validate idea\.yaml(?:\*\*)?\s*\n"
+    r"(.*?)(?=\n\d+\.\s*\*\*|\n###?\s|\n##\s|\Z)",
+    re.DOTALL,
+)
+# Checks 16, 18 and 22 look for dependency-validation language. Each probe
+# is a tuple of lowercase literals that must appear in order on one line —
+# run via _any_line_probe over lowercased text instead of case-insensitive
+# .*-alternation regexes that backtrack across the whole prose.
+_PAYMENT_DB_PROBES = (
+    ("payment", "database", "present"),
+    ("database", "present", "payment"),
+    ("payment requires", "database"),
+    ("stack.database", "missing"),
+    ("stack.database", "present"),
+    ("stack.database", "also"),
+)
+_BOOTSTRAP_PAYMENT_DB_PROBES = _PAYMENT_DB_PROBES + (
+    ("stack.payment", "verify", "stack.database"),
+    ("stack.payment", "check", "stack.database"),
+)
+
+# change.md checks (16, 18, 25, 28, 29, 31, 37)
+_PAYMENT_REF_PROBES = (
+    ("adding ", "payment"),
+    ("payment", "stack"),
+)
+_PAYMENT_AUTH_PROBES = (
+    ("payment", "auth", "present"),
+    ("auth", "present", "payment"),
+    ("payment requires auth",),
+)
+_FEATURE_CONSTRAINTS_RE = re.compile(
+    r"####?\s+feature constraints\s*\n(.*?)(?=\n####?\s|\Z)", re.DOTALL
+)
+_CHANGE_PAYMENT_DB_PROBES = _PAYMENT_DB_PROBES + (
+    ("both", "stack.auth", "stack.database"),
+)
+_CHANGE_TESTING_RE = re.compile(
+    r"(?:test.*(?:add|update).*(?:idea\.yaml|stack).*testing|"
+    r"testing.*(?:idea\.yaml|stack)|"
+    r"stack\.testing.*idea\.yaml)"
+)
+_ASSUMES_LIST_RE = re.compile(r"assumes.*list")
+_VALUE_MATCH_RE = re.compile(
+    r"category[/:]value|value\s+(?:must\s+)?match|"
+    r"matching\s+.*pair|category:\s*value.*pair|"
+    r"not just.*(?:category|present)"
+)
+_CATEGORY_ONLY_PROBE = "check if the corresponding stack category exists"
+_PAYMENT_STOP_RE = re.compile(
+    r"payment requires (?:authentication|a database)"
+)
+_PLAN_PHASE_RE = re.compile(r"## Phase 1|### STOP")
+_CHANGE_PRECONDITIONS_RE = re.compile(
+    r"## Step \d+:.*?[Cc]heck preconditions.*?\n(.*?)(?=\n## Step \d|\n## Phase|\Z)",
+    re.DOTALL,
+)
+_NON_TEST_ASSUMES_RE = re.compile(
+    r"(?:not\s+test|type\s+is\s+not\s+test).*testing.*assumes|"
+    r"testing.*assumes.*(?:not\s+test|type\s+is\s+not\s+test)",
+    re.DOTALL,
+)
+_CLASSIFY_STEP_RE = re.compile(
+    r"^## Step (\d+):.*(?:Classify|classify)", re.MULTILINE
+)
+_STEP_RE = re.compile(
+    r"^## Step (\d+):.*\n(.*?)(?=^## Step \d|\Z)", re.MULTILINE | re.DOTALL
+)
+_CLASSIFICATION_DEP_RE = re.compile(
+    r"classified as|is classified as|is a Fix|is NOT Test"
+)
+
+# Stack-file section checks (17, 21, 23, 24, 26, 27, 30, 32, 34, 35)
+_CI_E2E_RE = re.compile(r"e2e:.*?(?=\n  \w+:|\Z)", re.DOTALL)
+_STRIPE_VAR_RE = re.compile(r"(STRIPE_\w+|NEXT_PUBLIC_STRIPE_\w+)")
+_CI_TOKEN_RE = re.compile(r"[A-Z][A-Z0-9_]+")
+_FALLBACK_HINT_RE = re.compile(r"(?i)fallback|no[- ]auth")
+_TODO_REDIRECT_RE = re.compile(r"//\s*TODO.*redirect", re.IGNORECASE)
+_FALLBACK_SECTION_RE = re.compile(r"(?i)## No-Auth Fallback|## .*Fallback")
+_FM_BLOCK_RE = re.compile(r"^---\n(.*?\n)---", re.DOTALL)
+_FILES_LINE_RE = re.compile(r"^files:.*$", re.MULTILINE)
+_NOAUTH_CI_TEMPLATE_RE = re.compile(
+    r"### No-Auth CI Job Template\s*\n(.*?)(?=\n### |\n## |\Z)", re.DOTALL
+)
+_DB_ENV_VAR_RE = re.compile(
+    r"(NEXT_PUBLIC_SUPABASE_URL|NEXT_PUBLIC_SUPABASE_ANON_KEY)"
+)
+
+# Skill prose checks (33, 41, 42, 43)
+_BACKTICK_TOKEN_RE = re.compile(r"`([a-z][a-z0-9_]+)`")
+_EVENT_CONTEXT_RE = re.compile(r"\bevent\b|\bfire\b")
+_FROM_EVENTS_RE = re.compile(r"(?:from|in)\s+events\.yaml")
+_DOCS_REF_RE = re.compile(r"`(docs/google-ads-setup\.md)`")
+_DISTRIBUTE_STEP1_RE = re.compile(
+    r"## Step 1:.*?\n(.*?)(?=\n## Step 2:|\Z)", re.DOTALL
+)
+_ANALYTICS_VALIDATION_RE = re.compile(
+    r"(?i)analytics.*(?:required|not present|not configured).*stop|"
+    r"stack\.analytics.*(?:present|not|missing)|"
+    r"(?:verify|check).*stack\.analytics"
+)
+_VALIDATION_CONTEXT_RE = re.compile(r"(?i)stop|list|malformed|missing")
+
+
+@lru_cache(maxsize=None)
+def _line_offsets(content: str) -> list[int]:
+    """Byte offsets of every newline in content, computed once per string."""
+    return [m.start() for m in re.finditer("\n", content)]
+
+
+def line_of(content: str, pos: int) -> int:
+    """1-based line number of a byte offset — O(log n) bisect, no slicing."""
+    return bisect.bisect_right(_line_offsets(content), pos) + 1
+
+
+def parse_frontmatter_content(content: str) -> dict | None:
+    """Extract YAML frontmatter from already-read markdown content.
+
+    Locates the fence with plain string scans — no DOTALL regex over the
+    whole file body.
+    """
+    if not content.startswith("---\n"):
+        return None
+    end = content.find("\n---", 4)
+    if end < 0:
         return None
-    return yaml.safe_load(m.group(1))
+    return yaml.load(content[4 : end + 1], Loader=SafeLoader)
 
 
 def extract_code_blocks(content: str, lang_filter: set[str] | None = None) -> list[dict]:
@@ -79,42 +285,290 @@ def extract_code_blocks(content: str, lang_filter: set[str] | None = None) -> li
     If lang_filter is provided, only blocks with matching language tags are returned.
     """
     blocks = []
-    pattern = re.compile(r"^```(\w+)?\s*\n(.*?)^```", re.MULTILINE | re.DOTALL)
-    for m in pattern.finditer(content):
+    for m in _CODE_BLOCK_RE.finditer(content):
         lang = m.group(1) or ""
         if lang_filter and lang not in lang_filter:
             continue
-        start_line = content[: m.start()].count("\n") + 1
+        start_line = line_of(content, m.start())
         blocks.append({"lang": lang, "code": m.group(2), "start_line": start_line})
     return blocks
 
 
+def _ordered_probe(line: str, *needles: str) -> bool:
+    """True when every needle appears in line, in order, without overlap."""
+    pos = 0
+    for needle in needles:
+        pos = line.find(needle, pos)
+        if pos < 0:
+            return False
+        pos += len(needle)
+    return True
+
+
+def _any_line_probe(text_lc: str, probes: tuple[tuple[str, ...], ...]) -> bool:
+    """True when any line of (already lowercased) text satisfies a probe."""
+    return any(
+        any(_ordered_probe(line, *probe) for probe in probes)
+        for line in text_lc.splitlines()
+    )
+
+
+def code_block_mask(text: str) -> bytearray:
+    """Byte mask over text: 1 inside fenced code blocks (fences included),
+    0 in prose. One line-oriented pass — callers filter match positions
+    against it instead of allocating a fence-stripped copy of the text."""
+    mask = bytearray(len(text))
+    pos = 0
+    in_block = False
+    for line in text.splitlines(keepends=True):
+        end = pos + len(line)
+        if line.startswith("```"):
+            mask[pos:end] = b"\x01" * len(line)
+            in_block = not in_block
+        elif in_block:
+            mask[pos:end] = b"\x01" * len(line)
+        pos = end
+    return mask
+
+
+def iter_code_blocks(text: str, langs: set[str]):
+    """Yield the body of each fenced code block whose language tag is in langs.
+
+    Line-oriented single pass — no backtracking regex over the whole text.
+    Unclosed trailing fences are dropped, matching the regex extractors.
+    """
+    state: str | None = None
+    buf: list[str] = []
+    for line in text.splitlines(keepends=True):
+        if state is None:
+            if line.startswith("```"):
+                state = line[3:].strip()
+                buf = []
+        elif line.startswith("```"):
+            if state in langs:
+                yield "".join(buf)
+            state = None
+        else:
+            buf.append(line)
+
+
 def extract_prose(content: str) -> str:
     """Extract text outside of fenced code blocks."""
-    return re.sub(r"```\w*\s*\n.*?```", "", content, flags=re.MULTILINE | re.DOTALL)
+    return _PROSE_STRIP_RE.sub("", content)
+
+
+def extract_prose_mapped(content: str) -> tuple[str, tuple[list[int], list[int]]]:
+    """Like extract_prose, but also returns offset tables mapping positions
+    in the stripped prose back to positions in the original content."""
+    parts = []
+    starts = [0]
+    shifts = [0]
+    last = 0
+    prose_len = 0
+    for m in _PROSE_STRIP_RE.finditer(content):
+        parts.append(content[last : m.start()])
+        prose_len += m.start() - last
+        last = m.end()
+        starts.append(prose_len)
+        shifts.append(last - prose_len)
+    parts.append(content[last:])
+    return "".join(parts), (starts, shifts)
+
+
+def prose_pos(prose_map: tuple[list[int], list[int]], pos: int) -> int:
+    """Map a position in stripped prose back to the original content."""
+    starts, shifts = prose_map
+    return pos + shifts[bisect.bisect_right(starts, pos) - 1]
+
+
+@dataclass(frozen=True)
+class FixtureView:
+    """Type-normalized view of a parsed fixture.
+
+    Checks that only consume well-formed fixtures (7, 13) read these fields
+    without re-checking shapes; stack is None when idea.stack is present but
+    not a mapping. Check 3 validates the raw structure and reports shape
+    errors, so it keeps working from the parsed dict directly.
+    """
+
+    idea: dict
+    stack: dict | None
+    pages: list
+    assertions: dict
+    events: dict
+
+
+def make_fixture_view(fixture: dict) -> FixtureView:
+    idea = fixture.get("idea")
+    if not isinstance(idea, dict):
+        idea = {}
+    stack = idea.get("stack", {})
+    pages = idea.get("pages")
+    assertions = fixture.get("assertions")
+    events = fixture.get("events")
+    return FixtureView(
+        idea=idea,
+        stack=stack if isinstance(stack, dict) else None,
+        pages=pages if isinstance(pages, list) else [],
+        assertions=assertions if isinstance(assertions, dict) else {},
+        events=events if isinstance(events, dict) else {},
+    )
+
+
+@dataclass(frozen=True)
+class StackMeta:
+    """Derived frontmatter fields for one stack file, computed once.
+
+    Checks 17, 19, 21 and 26 read these flattened views instead of each
+    rebuilding sets from the parsed frontmatter mapping per file.
+    """
+
+    env_all: frozenset[str]
+    env_vars: tuple[str, ...]
+    pkg_all: frozenset[str]
+    assumes: tuple[str, ...]
+    optional_assumes: tuple[str, ...]
+
+
+def make_stack_meta(fm: dict) -> StackMeta:
+    env = fm.get("env", {}) or {}
+    server = env.get("server", []) or []
+    client = env.get("client", []) or []
+    pkgs = fm.get("packages", {}) or {}
+    assumes = tuple(fm.get("assumes", []) or [])
+    return StackMeta(
+        env_all=frozenset(server) | frozenset(client),
+        env_vars=tuple(server) + tuple(client),
+        pkg_all=(
+            frozenset(pkgs.get("runtime", []) or [])
+            | frozenset(pkgs.get("dev", []) or [])
+        ),
+        assumes=assumes,
+        optional_assumes=tuple(
+            a for a in assumes if a.split("/")[0] in OPTIONAL_CATEGORIES
+        ),
+    )
 
 
 # ---------------------------------------------------------------------------
 # Collect files
 # ---------------------------------------------------------------------------
 
-stack_files = sorted(
-    f
-    for f in glob.glob(".claude/stacks/**/*.md", recursive=True)
-    if "TEMPLATE" not in f
-)
-skill_files = sorted(glob.glob(".claude/commands/*.md"))
+def _walk_md(root: str):
+    """Yield .md paths under root via scandir — the directory read itself
+    supplies entry types, so no per-file stat or fnmatch pass."""
+    try:
+        it = os.scandir(root)
+    except FileNotFoundError:
+        return
+    with it:
+        for entry in it:
+            if "TEMPLATE" in entry.name:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk_md(entry.path)
+            elif entry.name.endswith(".md"):
+                yield entry.path
+
+
+stack_files = sorted(_walk_md(".claude/stacks"))
+skill_files: list[str] = []
+try:
+    with os.scandir(".claude/commands") as _it:
+        skill_files = sorted(
+            e.path for e in _it if e.is_file() and e.name.endswith(".md")
+        )
+except FileNotFoundError:
+    pass
+
+def _read(path: str) -> str:
+    # Binary read + one-shot decode skips the TextIOWrapper incremental
+    # codec; normalize CRLF ourselves since that skips universal newlines
+    # too, and the fence/section scans assume bare "\n"
+    with open(path, "rb") as f:
+        return f.read().decode("utf-8").replace("\r\n", "\n")
+
+
+def _read_all(paths: list[str]) -> dict[str, str]:
+    """Read many small files, overlapping I/O once there are enough of them.
+
+    Below the threshold the thread pool costs more than it saves, so read
+    serially.
+    """
+    if len(paths) >= 16:
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            return dict(zip(paths, ex.map(_read, paths)))
+    return {p: _read(p) for p in paths}
+
 
 # Pre-read all file contents
-stack_contents: dict[str, str] = {}
-for sf in stack_files:
-    with open(sf) as f:
-        stack_contents[sf] = f.read()
+stack_contents: dict[str, str] = _read_all(stack_files)
+skill_contents: dict[str, str] = _read_all(skill_files)
+
+# One scan over the '## ' headings per stack file — section-based checks look
+# bodies up here instead of each running its own DOTALL section regex
+
 
-skill_contents: dict[str, str] = {}
-for sf in skill_files:
-    with open(sf) as f:
-        skill_contents[sf] = f.read()
+def index_sections(content: str) -> dict[str, tuple[str, int]]:
+    """Map each '## ' heading to (section body, heading offset).
+
+    A section body runs from the end of its heading line to the start of the
+    next '## ' heading — '###' subsections stay inside their parent section.
+    The walk is pure str.find on the literal '\\n## ' boundary; no regex.
+    """
+    sections: dict[str, tuple[str, int]] = {}
+    pos = 0 if content.startswith("## ") else content.find("\n## ") + 1
+    while pos > 0 or (pos == 0 and content.startswith("## ")):
+        line_end = content.find("\n", pos)
+        if line_end < 0:
+            line_end = len(content)
+        name = content[pos + 3 : line_end].strip()
+        nxt = content.find("\n## ", line_end)
+        end = nxt + 1 if nxt >= 0 else len(content)
+        if name:
+            sections[name] = (content[line_end + 1 : end], pos)
+        if nxt < 0:
+            break
+        pos = end
+    return sections
+
+
+# Parse frontmatter, strip prose and index sections once per file — the
+# checks below look these up instead of re-running the DOTALL regexes once
+# per check
+stack_fm: dict[str, dict | None] = {}
+stack_prose: dict[str, str] = {}
+stack_sections: dict[str, dict[str, tuple[str, int]]] = {}
+stack_blocks: dict[str, list[dict]] = {}
+for sf, content in stack_contents.items():
+    stack_fm[sf] = parse_frontmatter_content(content)
+    stack_prose[sf] = extract_prose(content)
+    stack_sections[sf] = index_sections(content)
+    # Unfiltered — both per-file check passes filter by lang membership
+    stack_blocks[sf] = extract_code_blocks(content)
+
+# "category/value" and bare category per stack file, derived once from the
+# path — several checks key on these
+stack_cat_val: dict[str, str] = {
+    sf: sf[len(".claude/stacks/") : -len(".md")] for sf in stack_files
+}
+stack_category: dict[str, str] = {
+    sf: cv.split("/", 1)[0] for sf, cv in stack_cat_val.items()
+}
+testing_stack_files: list[str] = [
+    sf for sf in stack_files if "/testing/" in sf
+]
+
+skill_fm: dict[str, dict | None] = {}
+skill_prose: dict[str, str] = {}
+skill_prose_map: dict[str, tuple[list[int], list[int]]] = {}
+# Lowercased once per file — the wording checks run lowercase-literal
+# patterns against these instead of paying the IGNORECASE tax per search
+skill_lc: dict[str, str] = {}
+for sf, content in skill_contents.items():
+    skill_fm[sf] = parse_frontmatter_content(content)
+    skill_prose[sf], skill_prose_map[sf] = extract_prose_mapped(content)
+    skill_lc[sf] = content.lower()
 
 # Required fields for idea.yaml — used by Check 3 (fixtures) and Check 6 (consistency)
 REQUIRED_IDEA_FIELDS = [
@@ -134,10 +588,14 @@ REQUIRED_IDEA_FIELDS = [
 ]
 
 # ---------------------------------------------------------------------------
-# Check 1: Import Completeness in TSX Templates
+# Per-file checks, fused into one traversal per file set:
+#   stack files — Checks 1, 4a, 9, 11, 13, 14
+#   skill files — Checks 5, 8, 12
+# Each file's content, frontmatter, prose, code blocks and headers are walked
+# once; the individual checks share those instead of re-extracting per pass.
 # ---------------------------------------------------------------------------
 
-# Components that don't need explicit imports
+# Check 1: components that don't need explicit imports
 BUILTIN_COMPONENTS = {
     "Fragment",
     "Suspense",
@@ -147,32 +605,104 @@ BUILTIN_COMPONENTS = {
 # HTML-like elements that happen to be capitalized (shouldn't match, but just in case)
 HTML_ELEMENTS = set()
 
-for sf, content in stack_contents.items():
-    blocks = extract_code_blocks(content, {"tsx", "jsx"})
+# Check 5: stack categories that are optional per bootstrap.md
+OPTIONAL_CATEGORIES = {"database", "auth", "payment", "testing"}
+
+# Check 5: guard-detection regex per category, compiled once instead of per
+# reference inside the scan loop
+_GUARD_RES = {
+    category: re.compile(
+        rf"(?i)(?:if\s+.*(?:stack\.{category}|`stack\.{category}`)|"
+        rf"if\b.*\b{category}\b.*\bpresent\b)",
+        re.DOTALL,
+    )
+    for category in OPTIONAL_CATEGORIES
+}
+
+# Derived frontmatter views — one StackMeta per stack file with parseable
+# frontmatter
+stack_meta: dict[str, StackMeta] = {
+    sf: make_stack_meta(fm) for sf, fm in stack_fm.items() if fm
+}
+
+# Check 8: valid tool names
+KNOWN_TOOLS = {
+    "Read", "Write", "Edit", "Bash", "Glob", "Grep",
+    "WebFetch", "WebSearch", "Task", "NotebookEdit",
+    "AskUserQuestion", "EnterPlanMode", "ExitPlanMode",
+    "Skill", "TaskCreate", "TaskUpdate", "TaskGet", "TaskList",
+    "TaskOutput", "TaskStop",
+}
+
+# Check 11: map provider-specific identifiers found in code to their
+# category/value pair
+PROVIDER_IDENTIFIERS: dict[str, str] = {
+    "posthog": "analytics/posthog",
+    "amplitude": "analytics/amplitude",
+    "segment": "analytics/segment",
+    "stripe": "payment/stripe",
+}
+
+# Single case-insensitive scan for all provider identifiers at once — no
+# per-provider substring pass or lowercased copy of each code block
+_PROVIDER_ID_RE = re.compile(
+    "|".join(map(re.escape, PROVIDER_IDENTIFIERS)), re.IGNORECASE
+)
+
+# Check 12: spec files that should be in reads when referenced as a source of
+# truth. Excludes runtime-check files (package.json, .env.example) which are
+# existence checks, not files Claude reads for context.
+SPEC_REFERENCE_FILES = {"CLAUDE.md", "EVENTS.yaml"}
+_SPEC_REF_RES = {
+    f: re.compile(rf"\b{re.escape(f)}\b") for f in SPEC_REFERENCE_FILES
+}
+
+# Check 14: prose markers for a fallback section
+FALLBACK_INDICATORS = re.compile(
+    r"(?i)\b(?:fallback|no[- ]auth|without|not met|absent|simplified|"
+    r"when.*(?:not|missing|absent)|anonymous)\b"
+)
 
+# Check 14: only flag when assumes include optional categories — mandatory
+# categories (framework, analytics, ui, hosting) are always present per
+# bootstrap.md
+OPTIONAL_ASSUME_CATEGORIES = {"database", "auth", "payment", "testing"}
+
+
+def check_stack_file(
+    sf: str, content: str, fixture_stacks: list[dict] | None
+) -> None:
+    """Run Checks 1, 4a, 9, 11, 13, 14 against a single stack file."""
+    fm = stack_fm[sf]
+    prose = stack_prose[sf]
+    cat_val = stack_cat_val[sf]
+    category = stack_category[sf]
+
+    # Filter the shared block cache and index section headers once for all
+    # checks below
+    blocks = [
+        b for b in stack_blocks[sf] if b["lang"] in ("ts", "tsx", "js", "jsx")
+    ]
+    headers = [(m.start(), m.group(1)) for m in _HEADER_RE.finditer(content)]
+
+    # -- Check 1: Import Completeness in TSX Templates --
     for block in blocks:
+        if block["lang"] not in ("tsx", "jsx"):
+            continue
         code = block["code"]
-        # Find JSX component usage: <ComponentName or <ComponentName> or <ComponentName/
-        used_components = set(re.findall(r"<([A-Z][a-zA-Z]+)", code))
-        used_components -= BUILTIN_COMPONENTS
-
-        # Find imported components
+        # One pass collects JSX component usage (<ComponentName) and imports
+        used_components: set[str] = set()
         imported: set[str] = set()
-        for m in re.finditer(
-            r"import\s+(?:type\s+)?(?:\{([^}]+)\}|(\w+))\s+from", code
-        ):
-            if m.group(1):
-                # Named imports: import { Foo, Bar } from ...
-                for name in m.group(1).split(","):
-                    name = name.strip()
-                    # Handle "Foo as Bar" aliasing
-                    if " as " in name:
-                        name = name.split(" as ")[1].strip()
-                    if name:
-                        imported.add(name)
-            if m.group(2):
+        for m in _JSX_AND_IMPORT_RE.finditer(code):
+            if m.group("jsx"):
+                used_components.add(m.group("jsx"))
+            elif m.group("named"):
+                # Named imports: import { Foo, Bar as Baz } from ...
+                imported.update(_NAMED_IMPORT_RE.findall(m.group("named")))
+            elif m.group("default"):
                 # Default import: import Foo from ...
-                imported.add(m.group(2))
+                imported.add(m.group("default"))
+        used_components -= BUILTIN_COMPONENTS
 
         missing = used_components - imported
         for comp in sorted(missing):
@@ -182,14 +712,217 @@ for sf, content in stack_contents.items():
                 f"not imported in code block"
             )
 
+    # -- Check 4a: code block section headers (### `path`) in files: frontmatter --
+    if fm:
+        fm_files = set(fm.get("files", []) or [])
+        header_paths = {path for _, path in headers}
+        for path in sorted(header_paths):
+            if path not in fm_files:
+                error(
+                    f"[4] {sf}: code block header path '{path}' not listed in "
+                    f"frontmatter 'files'"
+                )
+
+    # -- Check 9: Env Loading Outside Next.js Runtime --
+    # Whole-file gate: most stack files never touch process.env
+    if "process.env." in content:
+        runtime_blocks = [b for b in blocks if b["lang"] in ("ts", "tsx", "js")]
+
+        # Check if any code block in this stack file already loads env
+        # (e.g., playwright.config.ts loads env for all Playwright templates)
+        file_has_env_loader = any(
+            _ENV_LOADER_RE.search(b["code"])
+            for b in runtime_blocks
+        )
+
+        # Header line numbers, resolved once rather than per block
+        header_lines = [(line_of(content, pos), path) for pos, path in headers]
+
+        for block in runtime_blocks:
+            block_start = block["start_line"]
+            # Find closest header before this block
+            closest_path = None
+            for hdr_line, path in header_lines:
+                if hdr_line < block_start:
+                    closest_path = path
+
+            if not closest_path or closest_path.startswith("src/"):
+                continue
+
+            if "process.env." not in block["code"]:
+                continue
+
+            has_env_loading = bool(
+                _ENV_LOADER_RE.search(block["code"])
+            )
+            if not has_env_loading and not file_has_env_loader:
+                error(
+                    f"[9] {sf}: template for '{closest_path}' uses process.env "
+                    f"but doesn't load env config (loadEnvConfig/dotenv/@next/env)"
+                )
+
+    # -- Check 11: Hardcoded Provider Names Match Assumes --
+    # Same gate: skip the per-block scans when no provider name appears at all
+    if fm and _PROVIDER_ID_RE.search(content):
+        assumes = set(fm.get("assumes", []) or [])
+        for block in blocks:
+            found = {hit.lower() for hit in _PROVIDER_ID_RE.findall(block["code"])}
+            for identifier, category_value in PROVIDER_IDENTIFIERS.items():
+                if identifier in found:
+                    # Check this isn't the stack file for that provider itself
+                    if cat_val == category_value:
+                        continue
+                    if category_value not in assumes:
+                        error(
+                            f"[11] {sf}:{block['start_line']}: code block uses "
+                            f"'{identifier}' but '{category_value}' not in "
+                            f"assumes frontmatter"
+                        )
+                        break  # One error per file per provider is enough
+
+    # -- Check 13: Fixture Coverage for Stack File Branching Conditions --
+    if fixture_stacks is not None:
+        # Find "when stack.X is NOT Y" or "when stack.X is also Y" patterns
+        for m in _NOT_BRANCH_RE.finditer(prose):
+            dep_category = m.group(1)
+            dep_value = m.group(2)
+
+            # Check if any fixture exercises the "NOT" branch
+            has_not_branch = any(
+                dep_category not in fs or fs.get(dep_category) != dep_value
+                for fs in fixture_stacks
+                if category in fs  # Only fixtures that use this stack category
+            )
+
+            if not has_not_branch:
+                error(
+                    f"[13] {sf}: has conditional for 'stack.{dep_category} "
+                    f"is NOT {dep_value}' but no fixture exercises this branch"
+                )
+
+    # -- Check 14: Stack File Provides Fallback When Assumes Not Met --
+    if fm:
+        assumes_list = fm.get("assumes", []) or []
+        # Filter to only optional assumed dependencies
+        optional_assumes = [
+            a for a in assumes_list
+            if a.split("/")[0] in OPTIONAL_ASSUME_CATEGORIES
+        ]
+        if optional_assumes and not FALLBACK_INDICATORS.search(prose):
+            error(
+                f"[14] {sf}: has optional assumes {optional_assumes} but no "
+                f"fallback section for when dependencies are absent"
+            )
+
+
+def check_skill_file(sf: str, content: str) -> None:
+    """Run Checks 5, 8, 12 against a single skill file."""
+    fm = skill_fm[sf]
+    prose = skill_prose[sf]
+    prose_map = skill_prose_map[sf]
+    # Lowercase once per file; the prefilter below slices this instead of
+    # re-lowercasing a 150-char window per match
+    prose_lc = prose.lower()
+
+    # -- Check 5: Conditional Dependency References --
+    for m in _STACK_FILE_REF_RE.finditer(prose):
+        category = m.group(1)
+        if category not in OPTIONAL_CATEGORIES:
+            continue
+        start = max(0, m.start() - 150)
+        context_before = prose[start : m.start()]
+        # Literal prefilter: no "if" in the window means no guard can match
+        if "if" not in prose_lc[start : m.start()]:
+            has_guard = False
+        else:
+            has_guard = bool(_GUARD_RES[category].search(context_before))
+        if not has_guard:
+            line_num = line_of(content, prose_pos(prose_map, m.start()))
+            error(
+                f"[5] {sf}:{line_num}: reference to optional '{category}' "
+                f"stack file lacks conditional guard within 150 chars"
+            )
+
+    # -- Check 8: Tool & Prereq Validity --
+    for m in _TOOL_REF_RE.finditer(prose):
+        tool_name = m.group(1)
+        if tool_name not in KNOWN_TOOLS:
+            line_num = line_of(content, prose_pos(prose_map, m.start()))
+            error(
+                f"[8] {sf}:{line_num}: references unknown tool "
+                f"'{tool_name}'"
+            )
+
+    # -- Check 12: Prose File References in Reads Frontmatter --
+    if fm:
+        reads = set(fm.get("reads", []) or [])
+        for ref_file, ref_re in _SPEC_REF_RES.items():
+            # Look for directive references (e.g., "CLAUDE.md Rule 4", "per CLAUDE.md")
+            # Exclude example text like "(e.g., ... CLAUDE.md Rule Z)"
+            for m_ref in ref_re.finditer(prose):
+                # Skip if inside example parenthetical (e.g., ...)
+                start = max(0, m_ref.start() - 100)
+                context_before = prose[start : m_ref.start()]
+                if _EG_RE.search(context_before):
+                    continue
+
+                # Check if this file is in reads
+                matched = any(ref_file in r or r in ref_file for r in reads)
+                if not matched:
+                    line_num = line_of(content, prose_pos(prose_map, m_ref.start()))
+                    error(
+                        f"[12] {sf}:{line_num}: prose references '{ref_file}' "
+                        f"but it's not in 'reads' frontmatter"
+                    )
+                    break  # One error per file per reference is enough
+
+
+fixture_dir = "tests/fixtures"
+has_fixture_dir = os.path.isdir(fixture_dir)
+
+# Parse every fixture exactly once — Checks 3, 7 and 13 all consume these.
+# Files with invalid YAML are reported here and left out of the dict.
+fixture_files: list[str] = []
+fixtures: dict[str, dict | None] = {}
+if has_fixture_dir:
+    with os.scandir(fixture_dir) as _it:
+        fixture_files = sorted(
+            e.path for e in _it if e.name.endswith(".yaml") and e.is_file()
+        )
+    for ff in fixture_files:
+        with open(ff) as f:
+            try:
+                fixtures[ff] = yaml.load(f, Loader=SafeLoader)
+            except yaml.YAMLError as e:
+                error(f"[3] {ff}: invalid YAML: {e}")
+
+# Normalized views for the mapping-shaped fixtures
+fixture_views: dict[str, FixtureView] = {
+    ff: make_fixture_view(fixture)
+    for ff, fixture in fixtures.items()
+    if isinstance(fixture, dict)
+}
+
+# Check 13 input: stack configs from every fixture (None when no fixture dir)
+fixture_stacks: list[dict] | None = None
+if has_fixture_dir:
+    fixture_stacks = [
+        view.stack for view in fixture_views.values() if view.stack is not None
+    ]
+
+for sf, content in stack_contents.items():
+    check_stack_file(sf, content, fixture_stacks)
+
+for sf, content in skill_contents.items():
+    check_skill_file(sf, content)
+
 # ---------------------------------------------------------------------------
 # Check 2: Makefile Target Guards
 # ---------------------------------------------------------------------------
 
 makefile_path = "Makefile"
 if os.path.isfile(makefile_path):
-    with open(makefile_path) as f:
-        makefile_content = f.read()
+    makefile_content = _read(makefile_path)
 
     # Targets that don't need guards:
     # - Pre-bootstrap / meta: validate, clean, clean-all, help
@@ -208,39 +941,31 @@ if os.path.isfile(makefile_path):
     # Parse Makefile targets and their recipe lines
     # A target line looks like: target-name: [deps] ## comment
     # Recipe lines follow, indented with a tab
-    target_pattern = re.compile(r"^([a-zA-Z0-9_-]+)\s*:(?!=)", re.MULTILINE)
-    targets = {}
-    matches = list(target_pattern.finditer(makefile_content))
+    # name -> (recipe start, recipe end, offset of the target line).
+    # Recipes are sliced lazily by consumers, so exempt targets never
+    # allocate theirs
+    targets: dict[str, tuple[int, int, int]] = {}
+    matches = list(_MK_TARGET_RE.finditer(makefile_content))
     for i, m in enumerate(matches):
-        name = m.group(1)
         start = m.end()
         end = matches[i + 1].start() if i + 1 < len(matches) else len(makefile_content)
-        recipe = makefile_content[start:end]
-        targets[name] = recipe
+        targets[m.group(1)] = (start, end, m.start())
 
-    for target_name, recipe in targets.items():
+    for target_name, (start, end, target_pos) in targets.items():
         if target_name in EXEMPT_TARGETS:
             continue
-        if target_name.startswith("."):
-            continue
+        recipe = makefile_content[start:end]
 
         # Check if this target uses npm or node commands
-        uses_npm = bool(re.search(r"\bnpm\b|\bnpx\b|\bnode\b", recipe))
+        uses_npm = bool(_NPM_RE.search(recipe))
         if not uses_npm:
             continue
 
         # Check for a package.json guard
-        has_guard = bool(
-            re.search(r"if\s+\[.*package\.json", recipe)
-            or re.search(r"test\s+-f\s+package\.json", recipe)
-            or re.search(r"-f\s+package\.json", recipe)
-            or re.search(r"-e\s+package\.json", recipe)
-        )
+        has_guard = bool(_PKG_GUARD_RE.search(recipe))
 
         if not has_guard:
-            line_num = makefile_content[
-                : makefile_content.index(f"{target_name}:")
-            ].count("\n") + 1
+            line_num = line_of(makefile_content, target_pos)
             error(
                 f"[2] {makefile_path}:{line_num}: target '{target_name}' uses "
                 f"npm/node but has no package.json guard"
@@ -250,20 +975,14 @@ if os.path.isfile(makefile_path):
 # Check 3: Fixture Validation
 # ---------------------------------------------------------------------------
 
-fixture_dir = "tests/fixtures"
-if os.path.isdir(fixture_dir):
-    fixture_files = sorted(glob.glob(os.path.join(fixture_dir, "*.yaml")))
-
+if has_fixture_dir:
     if not fixture_files:
         error(f"[3] {fixture_dir}: no fixture files found")
 
     for ff in fixture_files:
-        with open(ff) as f:
-            try:
-                fixture = yaml.safe_load(f)
-            except yaml.YAMLError as e:
-                error(f"[3] {ff}: invalid YAML: {e}")
-                continue
+        if ff not in fixtures:
+            continue  # invalid YAML, already reported
+        fixture = fixtures[ff]
 
         if not isinstance(fixture, dict):
             error(f"[3] {ff}: fixture must be a YAML mapping")
@@ -281,7 +1000,7 @@ if os.path.isdir(fixture_dir):
 
         # Validate idea.name format
         name = idea.get("name", "")
-        if not re.match(r"^[a-z][a-z0-9-]*$", str(name)):
+        if not _IDEA_NAME_RE.match(str(name)):
             error(
                 f"[3] {ff}: idea.name '{name}' must be lowercase, start with "
                 f"a letter, and use only a-z, 0-9, hyphens"
@@ -356,28 +1075,12 @@ else:
 # ---------------------------------------------------------------------------
 # Check 4: Frontmatter ↔ Content Sync
 # ---------------------------------------------------------------------------
-
-# 4a: Code block section headers (### `path`) should be in files: frontmatter
-for sf, content in stack_contents.items():
-    fm = parse_frontmatter(sf)
-    if not fm:
-        continue
-
-    fm_files = set(fm.get("files", []) or [])
-    header_paths = set(re.findall(r"###\s+`([^`]+)`", content))
-
-    for path in sorted(header_paths):
-        if path not in fm_files:
-            error(
-                f"[4] {sf}: code block header path '{path}' not listed in "
-                f"frontmatter 'files'"
-            )
+# 4a (code block section headers in files: frontmatter) runs in the fused
+# per-stack-file pass above.
 
 # 4b: Makefile clean lines should match clean.files/clean.dirs frontmatter
 if os.path.isfile(makefile_path):
-    clean_match = re.search(
-        r"^clean:.*?\n((?:\t.*\n)*)", makefile_content, re.MULTILINE
-    )
+    clean_match = _MK_CLEAN_RE.search(makefile_content)
     if clean_match:
         clean_recipe = clean_match.group(1)
 
@@ -386,21 +1089,21 @@ if os.path.isfile(makefile_path):
             line_s = line.strip()
             if not line_s:
                 continue
-            tag_match = re.search(r"#\s+(\w+/\w+)\s*$", line_s)
+            tag_match = _CLEAN_TAG_RE.search(line_s)
             if not tag_match:
                 continue
             tag = tag_match.group(1)
             line_body = line_s[: tag_match.start()].strip()
-            rm_match = re.match(r"rm\s+(?:-rf|-f)\s+(.*)", line_body)
+            rm_match = _RM_RE.match(line_body)
             if rm_match:
                 items = rm_match.group(1).split()
                 makefile_clean_items.setdefault(tag, set()).update(items)
 
         for sf in stack_files:
-            fm = parse_frontmatter(sf)
+            fm = stack_fm[sf]
             if not fm or "clean" not in fm:
                 continue
-            cat_val = sf.replace(".claude/stacks/", "").replace(".md", "")
+            cat_val = stack_cat_val[sf]
             clean_fm = fm.get("clean", {}) or {}
             fm_clean_files = set(clean_fm.get("files", []) or [])
             fm_clean_dirs = set(clean_fm.get("dirs", []) or [])
@@ -430,45 +1133,14 @@ if os.path.isfile(makefile_path):
                 )
 
 # ---------------------------------------------------------------------------
-# Check 5: Conditional Dependency References
-# ---------------------------------------------------------------------------
-
-OPTIONAL_CATEGORIES = {"database", "auth", "payment", "testing"}
-
-for sf, content in skill_contents.items():
-    prose = extract_prose(content)
-    for m in re.finditer(r"from the (\w+) stack file", prose):
-        category = m.group(1)
-        if category not in OPTIONAL_CATEGORIES:
-            continue
-        start = max(0, m.start() - 150)
-        context_before = prose[start : m.start()]
-        has_guard = bool(
-            re.search(
-                rf"(?i)(?:if\s+.*(?:stack\.{category}|`stack\.{category}`)|"
-                rf"if\b.*\b{category}\b.*\bpresent\b)",
-                context_before,
-                re.DOTALL,
-            )
-        )
-        if not has_guard:
-            # Find line number in original content
-            match_text = m.group(0)
-            pos = content.find(match_text)
-            line_num = content[:pos].count("\n") + 1 if pos >= 0 else "?"
-            error(
-                f"[5] {sf}:{line_num}: reference to optional '{category}' "
-                f"stack file lacks conditional guard within 150 chars"
-            )
+# Check 5 runs in the fused per-skill-file pass above.
 
 # ---------------------------------------------------------------------------
 # Check 6: Required Fields Consistency
 # ---------------------------------------------------------------------------
 
 if os.path.isfile(makefile_path):
-    mk_required_match = re.search(
-        r"required\s*=\s*\[([^\]]+)\]", makefile_content
-    )
+    mk_required_match = _MK_REQUIRED_RE.search(makefile_content)
     if mk_required_match:
         mk_fields_raw = mk_required_match.group(1)
         mk_fields = [
@@ -488,346 +1160,101 @@ if os.path.isfile(makefile_path):
             error(
                 f"[6] validate-semantics.py has required field '{field}' "
                 f"missing from Makefile validate"
-            )
-
-# ---------------------------------------------------------------------------
-# Check 7: Fixture Stack Coverage
-# ---------------------------------------------------------------------------
-
-if os.path.isdir(fixture_dir):
-    fixture_files_cov = sorted(glob.glob(os.path.join(fixture_dir, "*.yaml")))
-
-    # Collect category/value pairs from stack file paths
-    stack_pairs = set()
-    for sf in stack_files:
-        pair = sf.replace(".claude/stacks/", "").replace(".md", "")
-        stack_pairs.add(pair)
-
-    # Collect stack coverage from all fixtures
-    fixture_stack_coverage: dict[str, set[str]] = {}
-    all_fixture_stacks: set[str] = set()
-
-    for ff in fixture_files_cov:
-        with open(ff) as f:
-            try:
-                fixture = yaml.safe_load(f)
-            except yaml.YAMLError:
-                continue
-        if not isinstance(fixture, dict):
-            continue
-        idea = fixture.get("idea", {})
-        stack = idea.get("stack", {})
-        if isinstance(stack, dict):
-            pairs = {f"{k}/{v}" for k, v in stack.items()}
-            fixture_stack_coverage[ff] = pairs
-            all_fixture_stacks |= pairs
-
-    # Each stack file should be covered by at least one fixture
-    for pair in sorted(stack_pairs):
-        if pair not in all_fixture_stacks:
-            error(
-                f"[7] Stack file .claude/stacks/{pair}.md has no "
-                f"fixture coverage in {fixture_dir}/"
-            )
-
-    # Parse bootstrap.md for mandatory categories
-    bootstrap_path = ".claude/commands/bootstrap.md"
-    if os.path.isfile(bootstrap_path):
-        with open(bootstrap_path) as f:
-            bootstrap_content = f.read()
-
-        always_match = re.search(
-            r"always:\s*([^;)]+?)(?:\)|;|$)", bootstrap_content
-        )
-        if always_match:
-            mandatory_cats = [
-                c.strip().rstrip(",")
-                for c in always_match.group(1).split(",")
-                if c.strip()
-            ]
-
-            for ff, pairs in fixture_stack_coverage.items():
-                fixture_cats = {p.split("/")[0] for p in pairs}
-                for cat in mandatory_cats:
-                    if cat not in fixture_cats:
-                        error(
-                            f"[7] {ff}: missing mandatory stack category "
-                            f"'{cat}' (must be in all fixtures)"
-                        )
-
-# ---------------------------------------------------------------------------
-# Check 8: Tool & Prereq Validity
-# ---------------------------------------------------------------------------
-
-KNOWN_TOOLS = {
-    "Read", "Write", "Edit", "Bash", "Glob", "Grep",
-    "WebFetch", "WebSearch", "Task", "NotebookEdit",
-    "AskUserQuestion", "EnterPlanMode", "ExitPlanMode",
-    "Skill", "TaskCreate", "TaskUpdate", "TaskGet", "TaskList",
-    "TaskOutput", "TaskStop",
-}
-
-for sf, content in skill_contents.items():
-    prose = extract_prose(content)
-    for m in re.finditer(r"using the (\w+) tool", prose):
-        tool_name = m.group(1)
-        if tool_name not in KNOWN_TOOLS:
-            pos = content.find(m.group(0))
-            line_num = content[:pos].count("\n") + 1 if pos >= 0 else "?"
-            error(
-                f"[8] {sf}:{line_num}: references unknown tool "
-                f"'{tool_name}'"
-            )
-
-# ---------------------------------------------------------------------------
-# Check 9: Env Loading Outside Next.js Runtime
-# ---------------------------------------------------------------------------
-
-for sf, content in stack_contents.items():
-    # Get section header positions
-    headers = [
-        (m.start(), m.group(1))
-        for m in re.finditer(r"###\s+`([^`]+)`", content)
-    ]
-    blocks = extract_code_blocks(content, {"ts", "tsx", "js"})
-
-    # Check if any code block in this stack file already loads env
-    # (e.g., playwright.config.ts loads env for all Playwright templates)
-    file_has_env_loader = any(
-        re.search(r"loadEnvConfig|dotenv|@next/env", b["code"])
-        for b in blocks
-    )
-
-    for block in blocks:
-        block_start = block["start_line"]
-        # Find closest header before this block
-        closest_path = None
-        for hdr_pos, path in headers:
-            hdr_line = content[:hdr_pos].count("\n") + 1
-            if hdr_line < block_start:
-                closest_path = path
-
-        if not closest_path or closest_path.startswith("src/"):
-            continue
-
-        if "process.env." not in block["code"]:
-            continue
-
-        has_env_loading = bool(
-            re.search(r"loadEnvConfig|dotenv|@next/env", block["code"])
-        )
-        if not has_env_loading and not file_has_env_loader:
-            error(
-                f"[9] {sf}: template for '{closest_path}' uses process.env "
-                f"but doesn't load env config (loadEnvConfig/dotenv/@next/env)"
-            )
-
-# ---------------------------------------------------------------------------
-# Check 10: Validate Warning Differentiation
-# ---------------------------------------------------------------------------
-
-if os.path.isfile(makefile_path):
-    validate_recipe = targets.get("validate", "")
-
-    has_conditional = bool(
-        re.search(r"(?i)WARN|warning.*if|if.*warn", validate_recipe)
-    )
-    has_passed_message = bool(
-        re.search(r"Validation passed", validate_recipe)
-    )
-
-    if has_passed_message and not has_conditional:
-        error(
-            f"[10] Makefile validate: success message is unconditional — "
-            f"should differentiate between clean pass and pass with warnings"
-        )
-
-# ---------------------------------------------------------------------------
-# Check 11: Hardcoded Provider Names Match Assumes
-# ---------------------------------------------------------------------------
-
-# Map provider-specific identifiers found in code to their category/value pair
-PROVIDER_IDENTIFIERS: dict[str, str] = {
-    "posthog": "analytics/posthog",
-    "amplitude": "analytics/amplitude",
-    "segment": "analytics/segment",
-    "stripe": "payment/stripe",
-}
-
-for sf, content in stack_contents.items():
-    fm = parse_frontmatter(sf)
-    if not fm:
-        continue
-    assumes = set(fm.get("assumes", []) or [])
-    blocks = extract_code_blocks(content, {"ts", "tsx", "js", "jsx"})
-
-    for block in blocks:
-        code_lower = block["code"].lower()
-        for identifier, category_value in PROVIDER_IDENTIFIERS.items():
-            if identifier in code_lower:
-                # Check this isn't the stack file for that provider itself
-                cat_val = sf.replace(".claude/stacks/", "").replace(".md", "")
-                if cat_val == category_value:
-                    continue
-                if category_value not in assumes:
-                    error(
-                        f"[11] {sf}:{block['start_line']}: code block uses "
-                        f"'{identifier}' but '{category_value}' not in "
-                        f"assumes frontmatter"
-                    )
-                    break  # One error per file per provider is enough
-
-# ---------------------------------------------------------------------------
-# Check 12: Prose File References in Reads Frontmatter
-# ---------------------------------------------------------------------------
-
-# Spec files that should be in reads when referenced as a source of truth.
-# Excludes runtime-check files (package.json, .env.example) which are existence
-# checks, not files Claude reads for context.
-SPEC_REFERENCE_FILES = {"CLAUDE.md", "EVENTS.yaml"}
-
-for sf, content in skill_contents.items():
-    fm = parse_frontmatter(sf)
-    if not fm:
-        continue
-    reads = set(fm.get("reads", []) or [])
-    prose = extract_prose(content)
-
-    for ref_file in SPEC_REFERENCE_FILES:
-        # Look for directive references (e.g., "CLAUDE.md Rule 4", "per CLAUDE.md")
-        # Exclude example text like "(e.g., ... CLAUDE.md Rule Z)"
-        for m_ref in re.finditer(
-            rf"\b{re.escape(ref_file)}\b", prose
-        ):
-            # Skip if inside example parenthetical (e.g., ...)
-            start = max(0, m_ref.start() - 100)
-            context_before = prose[start : m_ref.start()]
-            if re.search(r"e\.g\.\s*,", context_before):
-                continue
-
-            # Check if this file is in reads
-            matched = any(ref_file in r or r in ref_file for r in reads)
-            if not matched:
-                pos = content.find(ref_file)
-                line_num = content[:pos].count("\n") + 1 if pos >= 0 else "?"
-                error(
-                    f"[12] {sf}:{line_num}: prose references '{ref_file}' "
-                    f"but it's not in 'reads' frontmatter"
-                )
-                break  # One error per file per reference is enough
+            )
 
 # ---------------------------------------------------------------------------
-# Check 13: Fixture Coverage for Stack File Branching Conditions
+# Check 7: Fixture Stack Coverage
 # ---------------------------------------------------------------------------
 
-if os.path.isdir(fixture_dir):
-    fixture_files_branch = sorted(glob.glob(os.path.join(fixture_dir, "*.yaml")))
+if has_fixture_dir:
+    # Collect category/value pairs from stack file paths
+    stack_pairs = set(stack_cat_val.values())
 
-    # Collect fixture stack configs
-    fixture_stacks_13: list[dict[str, str]] = []
-    for ff in fixture_files_branch:
-        with open(ff) as f:
-            try:
-                fixture = yaml.safe_load(f)
-            except yaml.YAMLError:
-                continue
-        if not isinstance(fixture, dict):
+    # Collect stack coverage from all fixtures
+    fixture_stack_coverage: dict[str, set[str]] = {}
+    all_fixture_stacks: set[str] = set()
+
+    for ff, view in fixture_views.items():
+        if view.stack is None:
             continue
-        idea = fixture.get("idea", {})
-        stack = idea.get("stack", {})
-        if isinstance(stack, dict):
-            fixture_stacks_13.append(stack)
+        pairs = {f"{k}/{v}" for k, v in view.stack.items()}
+        fixture_stack_coverage[ff] = pairs
+        all_fixture_stacks |= pairs
 
-    # For each stack file, check for conditional branching
-    for sf, content in stack_contents.items():
-        prose = extract_prose(content)
-        cat_val = sf.replace(".claude/stacks/", "").replace(".md", "")
-        category = cat_val.split("/")[0]
+    # Each stack file should be covered by at least one fixture
+    for pair in sorted(stack_pairs):
+        if pair not in all_fixture_stacks:
+            error(
+                f"[7] Stack file .claude/stacks/{pair}.md has no "
+                f"fixture coverage in {fixture_dir}/"
+            )
 
-        # Find "when stack.X is NOT Y" or "when stack.X is also Y" patterns
-        for m in re.finditer(
-            r"(?i)when\s+`?stack\.(\w+)`?\s+is\s+NOT\s+(\w+)",
-            prose,
-        ):
-            dep_category = m.group(1)
-            dep_value = m.group(2)
+    # Parse bootstrap.md for mandatory categories
+    bootstrap_path = ".claude/commands/bootstrap.md"
+    bootstrap_content = skill_contents.get(bootstrap_path)
+    if bootstrap_content is not None:
+        always_match = _BOOTSTRAP_ALWAYS_RE.search(bootstrap_content)
+        if always_match:
+            mandatory_cats = [
+                c.strip().rstrip(",")
+                for c in always_match.group(1).split(",")
+                if c.strip()
+            ]
 
-            # Check if any fixture exercises the "NOT" branch
-            has_not_branch = any(
-                dep_category not in fs or fs.get(dep_category) != dep_value
-                for fs in fixture_stacks_13
-                if category in fs  # Only fixtures that use this stack category
-            )
+            for ff, pairs in fixture_stack_coverage.items():
+                fixture_cats = {p.split("/")[0] for p in pairs}
+                for cat in mandatory_cats:
+                    if cat not in fixture_cats:
+                        error(
+                            f"[7] {ff}: missing mandatory stack category "
+                            f"'{cat}' (must be in all fixtures)"
+                        )
 
-            if not has_not_branch:
-                error(
-                    f"[13] {sf}: has conditional for 'stack.{dep_category} "
-                    f"is NOT {dep_value}' but no fixture exercises this branch"
-                )
+# ---------------------------------------------------------------------------
+# Checks 8 and 9 run in the fused per-file passes above.
 
 # ---------------------------------------------------------------------------
-# Check 14: Stack File Provides Fallback When Assumes Not Met
+# Check 10: Validate Warning Differentiation
 # ---------------------------------------------------------------------------
 
-FALLBACK_INDICATORS = re.compile(
-    r"(?i)\b(?:fallback|no[- ]auth|without|not met|absent|simplified|"
-    r"when.*(?:not|missing|absent)|anonymous)\b"
-)
-
-# Only flag when assumes include optional categories — mandatory categories
-# (framework, analytics, ui, hosting) are always present per bootstrap.md
-OPTIONAL_ASSUME_CATEGORIES = {"database", "auth", "payment", "testing"}
+if os.path.isfile(makefile_path):
+    _validate_span = targets.get("validate")
+    validate_recipe = (
+        makefile_content[_validate_span[0] : _validate_span[1]]
+        if _validate_span
+        else ""
+    )
 
-for sf, content in stack_contents.items():
-    fm = parse_frontmatter(sf)
-    if not fm:
-        continue
-    assumes = fm.get("assumes", []) or []
-    if not assumes:
-        continue
-
-    # Filter to only optional assumed dependencies
-    optional_assumes = [
-        a for a in assumes
-        if a.split("/")[0] in OPTIONAL_ASSUME_CATEGORIES
-    ]
-    if not optional_assumes:
-        continue
+    has_conditional = bool(_VALIDATE_WARN_RE.search(validate_recipe))
+    has_passed_message = "Validation passed" in validate_recipe
 
-    prose = extract_prose(content)
-    if not FALLBACK_INDICATORS.search(prose):
+    if has_passed_message and not has_conditional:
         error(
-            f"[14] {sf}: has optional assumes {optional_assumes} but no "
-            f"fallback section for when dependencies are absent"
+            f"[10] Makefile validate: success message is unconditional — "
+            f"should differentiate between clean pass and pass with warnings"
         )
 
+# ---------------------------------------------------------------------------
+# Checks 11, 12, 13 and 14 run in the fused per-file passes above.
+
 # ---------------------------------------------------------------------------
 # Check 15: Makefile Deploy Hosting Guard
 # ---------------------------------------------------------------------------
 
 if os.path.isfile(makefile_path):
-    deploy_recipe = targets.get("deploy", "")
-
-    # Check for hosting-provider-specific commands
-    provider_commands = {
-        "vercel": r"\bvercel\b",
-        "netlify": r"\bnetlify\b",
-        "fly": r"\bfly\b|\bflyctl\b",
-    }
+    _deploy_span = targets.get("deploy")
+    if _deploy_span:
+        deploy_recipe = makefile_content[_deploy_span[0] : _deploy_span[1]]
+        deploy_pos = _deploy_span[2]
+    else:
+        deploy_recipe, deploy_pos = "", 0
 
-    for provider, pattern in provider_commands.items():
-        if re.search(pattern, deploy_recipe):
+    for provider, pattern in _PROVIDER_CMD_RES.items():
+        if pattern.search(deploy_recipe):
             # Check for a hosting stack guard
-            has_hosting_guard = bool(
-                re.search(
-                    r"(?:HOSTING|hosting|stack.*hosting)",
-                    deploy_recipe,
-                )
-            )
+            has_hosting_guard = bool(_HOSTING_GUARD_RE.search(deploy_recipe))
             if not has_hosting_guard:
-                line_num = makefile_content[
-                    : makefile_content.index("deploy:")
-                ].count("\n") + 1
+                line_num = line_of(makefile_content, deploy_pos)
                 error(
                     f"[15] Makefile:{line_num}: deploy target uses "
                     f"'{provider}' command without hosting stack guard"
@@ -838,24 +1265,17 @@ if os.path.isfile(makefile_path):
 # ---------------------------------------------------------------------------
 
 change_path = ".claude/commands/change.md"
-if os.path.isfile(change_path):
-    with open(change_path) as f:
-        change_content = f.read()
-    change_prose = extract_prose(change_content)
+change_prose_16 = skill_prose.get(change_path)
+if change_prose_16 is not None:
 
     # Check if change.md mentions adding payment
-    has_payment_ref = bool(
-        re.search(r"(?i)adding\s+.*payment|payment.*stack", change_prose)
+    change_prose_lc = change_prose_16.lower()
+    has_payment_ref = "payment" in change_prose_lc and _any_line_probe(
+        change_prose_lc, _PAYMENT_REF_PROBES
     )
     if has_payment_ref:
         # Look for auth-presence validation near the payment reference
-        has_auth_check = bool(
-            re.search(
-                r"(?i)payment.*auth.*present|auth.*present.*payment|"
-                r"payment\s+requires\s+auth",
-                change_prose,
-            )
-        )
+        has_auth_check = _any_line_probe(change_prose_lc, _PAYMENT_AUTH_PROBES)
         if not has_auth_check:
             error(
                 f"[16] {change_path}: mentions adding payment stack "
@@ -863,74 +1283,238 @@ if os.path.isfile(change_path):
             )
 
 # ---------------------------------------------------------------------------
-# Check 17: Stack File Env Vars in Prose Match Frontmatter Declarations
+# Section-based stack-file checks, fused into one traversal per file:
+#   Checks 17, 21, 24, 26, 27, 30, 32, 34, 35
+# Section bodies come from the shared stack_sections index instead of each
+# check re-scanning the whole file with its own DOTALL section regex.
 # ---------------------------------------------------------------------------
 
-# Look for "Environment Variables" sections in stack files and check that any
-# env var names mentioned in prose also appear in frontmatter env.server or env.client.
+# Check 17: env var names mentioned in Environment Variables prose must also
+# appear in frontmatter env.server or env.client
 ENV_VAR_PATTERN = re.compile(r"`?(NEXT_PUBLIC_[A-Z_]+|[A-Z][A-Z_]{3,}(?:_KEY|_URL|_ID|_SECRET|_TOKEN|_ANON_KEY|_ROLE_KEY))`?")
 
-for sf, content in stack_contents.items():
-    fm = parse_frontmatter(sf)
-    if not fm:
-        continue
-
-    env_section = fm.get("env", {}) or {}
-    fm_server = set(env_section.get("server", []) or [])
-    fm_client = set(env_section.get("client", []) or [])
-    fm_all_env = fm_server | fm_client
-
-    # Find "Environment Variables" section in prose
-    env_section_match = re.search(
-        r"##\s+Environment Variables\s*\n(.*?)(?=\n##\s|\Z)",
-        content,
-        re.DOTALL,
-    )
-    if not env_section_match:
-        continue
-
-    env_prose = env_section_match.group(1)
-    # Extract env var names from prose (outside code blocks)
-    env_prose_no_code = re.sub(r"```.*?```", "", env_prose, flags=re.DOTALL)
-    prose_env_vars: set[str] = set()
-    for m in ENV_VAR_PATTERN.finditer(env_prose_no_code):
-        var_name = m.group(1) or m.group(0).strip("`")
-        prose_env_vars.add(var_name)
-
-    for var in sorted(prose_env_vars - fm_all_env):
-        line_num = content[: env_section_match.start()].count("\n") + 1
-        error(
-            f"[17] {sf}:{line_num}: Environment Variables prose mentions "
-            f"'{var}' but it's not in frontmatter env.server or env.client"
+
+# Check 26: compiled alternation over a set of provider names, memoized —
+# the same small assumes set recurs across testing stack files
+@lru_cache(maxsize=None)
+def _provider_alternation(provider_names: frozenset[str]) -> "re.Pattern[str]":
+    return re.compile("|".join(map(re.escape, sorted(provider_names))))
+
+
+def check_stack_sections(sf: str, content: str) -> None:
+    """Run the section-based checks for one stack file."""
+    fm = stack_fm[sf]
+    meta = stack_meta.get(sf)
+    sections = stack_sections[sf]
+    is_testing = "/testing/" in sf
+
+    # Check 17: Stack File Env Vars in Prose Match Frontmatter Declarations
+    env_heading = sections.get("Environment Variables") if meta else None
+    if env_heading:
+        env_prose, env_heading_pos = env_heading
+        # Collect env var names from prose, skipping matches that fall
+        # inside code blocks
+        mask = code_block_mask(env_prose)
+        prose_env_vars: set[str] = set()
+        for m in ENV_VAR_PATTERN.finditer(env_prose):
+            if mask[m.start()]:
+                continue
+            var_name = m.group(1) or m.group(0).strip("`")
+            prose_env_vars.add(var_name)
+
+        for var in prose_env_vars - meta.env_all:
+            line_num = line_of(content, env_heading_pos)
+            error(
+                f"[17] {sf}:{line_num}: Environment Variables prose mentions "
+                f"'{var}' but it's not in frontmatter env.server or env.client"
+            )
+
+    # Check 21: Stack File Packages in Prose Match Frontmatter Declarations
+    pkg_heading = sections.get("Packages") if meta else None
+    if pkg_heading:
+        pkg_prose, pkg_heading_pos = pkg_heading
+
+        # Extract package names from "npm install ..." commands in code blocks
+        # within the Packages section
+        prose_packages: set[str] = set()
+        for code_block in iter_code_blocks(pkg_prose, {"bash", "sh"}):
+            for line in code_block.splitlines():
+                if not line.startswith("npm install"):
+                    continue
+                rest = line[len("npm install") :]
+                if not rest[:1].isspace():
+                    continue
+                # Filter out flags (e.g., -D, --save-dev) and keep only package names
+                prose_packages.update(
+                    t for t in rest.split() if not t.startswith("-")
+                )
+
+        for pkg in prose_packages - meta.pkg_all:
+            line_num = line_of(content, pkg_heading_pos)
+            error(
+                f"[21] {sf}:{line_num}: Packages prose contains 'npm install {pkg}' "
+                f"but '{pkg}' is not in frontmatter packages.runtime or packages.dev"
+            )
+
+    # Check 24: Testing Stack No-Auth Fallback Includes CI Job Template
+    if is_testing and fm:
+        fallback = sections.get("No-Auth Fallback")
+        if fallback:
+            fallback_section = fallback[0]
+            # Check for a YAML code block with an e2e: job definition
+            has_e2e_job = any(
+                "e2e:" in block
+                for block in iter_code_blocks(fallback_section, {"yaml"})
+            )
+            if not has_e2e_job:
+                error(
+                    f"[24] {sf}: No-Auth Fallback section missing a CI job "
+                    f"template (YAML code block with 'e2e:' job definition)"
+                )
+
+    # Check 26: Testing Stack Env Frontmatter Excludes Assumes-Dependent Vars
+    if is_testing and meta:
+        # Only applies when assumes are truly optional, i.e. a fallback exists
+        if meta.optional_assumes and _FALLBACK_HINT_RE.search(content):
+            # One alternation over all provider names from optional assumes —
+            # a single scan per var instead of a substring test per provider
+            provider_re = _provider_alternation(
+                frozenset(
+                    a.split("/")[1].upper() for a in meta.optional_assumes
+                )
+            )
+
+            for var in meta.env_vars:
+                provider_match = provider_re.search(var)
+                if provider_match:
+                    error(
+                        f"[26] {sf}: env frontmatter var '{var}' contains "
+                        f"provider name '{provider_match.group(0)}' from "
+                        f"optional assumes — should not be unconditional "
+                        f"when a fallback exists"
+                    )
+
+    # Check 27: Auth Template Post-Auth Redirects
+    if "/auth/" in sf:
+        blocks = [b for b in stack_blocks[sf] if b["lang"] in ("tsx", "jsx")]
+        for block in blocks:
+            code = block["code"]
+            # Check if this is a signup or login page template
+            is_signup = "signUp" in code or "handleSignup" in code
+            is_login = "signInWithPassword" in code or "handleLogin" in code
+            if not is_signup and not is_login:
+                continue
+
+            page_type = "signup" if is_signup else "login"
+
+            # Check for a redirect call after the auth success path —
+            # literal probes; only the TODO-comment case needs a regex
+            has_redirect = any(
+                s in code
+                for s in ("router.push(", "router.replace(", "redirect(")
+            )
+            has_only_todo = bool(_TODO_REDIRECT_RE.search(code))
+
+            if not has_redirect or has_only_todo:
+                error(
+                    f"[27] {sf}:{block['start_line']}: {page_type} page template "
+                    f"has no post-auth redirect (router.push/redirect) — only a "
+                    f"TODO comment"
+                    if has_only_todo
+                    else f"[27] {sf}:{block['start_line']}: {page_type} page "
+                    f"template missing post-auth redirect (router.push/redirect)"
+                )
+
+    # Checks 30 and 32: Analytics Stack Files Include Dashboard Navigation
+    # and Test Blocking Sections
+    if "/analytics/" in sf:
+        section_names = [name.lower() for name in sections]
+        if not any(n.startswith("dashboard navigation") for n in section_names):
+            error(
+                f"[30] {sf}: analytics stack file missing required "
+                f"'## Dashboard Navigation' section (needed by /iterate skill)"
+            )
+        if not any(n.startswith("test blocking") for n in section_names):
+            error(
+                f"[32] {sf}: analytics stack file missing required "
+                f"'## Test Blocking' section (needed by testing stack's "
+                f"blockAnalytics helper)"
+            )
+
+    # Check 34: Stack Files with Fallback Sections Annotate Conditional Files
+    fallback_start = _FALLBACK_SECTION_RE.search(content) if fm else None
+    fm_files = (fm.get("files", []) or []) if fm else []
+    if fallback_start and fm_files:
+        # Get the files line from frontmatter to check for # conditional comment
+        fm_match = _FM_BLOCK_RE.match(content)
+        files_line_match = (
+            _FILES_LINE_RE.search(fm_match.group(1)) if fm_match else None
         )
+        if files_line_match:
+            files_line = files_line_match.group(0)
+
+            # Find code block headers that only appear outside the fallback
+            # section — headers before the fallback belong to the full template
+            pre_fallback = content[: fallback_start.start()]
+            post_fallback = content[fallback_start.start():]
+
+            pre_headers = set(_HEADER_RE.findall(pre_fallback))
+            post_headers = set(_HEADER_RE.findall(post_fallback))
+
+            # Files whose headers only appear in pre-fallback (full template only)
+            full_only_headers = pre_headers - post_headers
+
+            # Check if any frontmatter files match full-only headers
+            assumes_dependent_files = [
+                f for f in fm_files if f in full_only_headers
+            ]
+
+            if assumes_dependent_files and "# conditional" not in files_line:
+                error(
+                    f"[34] {sf}: files frontmatter lists assumes-dependent files "
+                    f"{assumes_dependent_files} but lacks '# conditional' annotation"
+                )
+
+    # Check 35: No-Auth CI Template Includes Commented Database Placeholder
+    # Env Vars
+    if is_testing:
+        full_ci = sections.get("CI Job Template")
+        noauth_ci_match = _NOAUTH_CI_TEMPLATE_RE.search(content) if full_ci else None
+        if full_ci and noauth_ci_match:
+            full_ci_text = full_ci[0]
+            noauth_ci_text = noauth_ci_match.group(1)
+
+            # Check for database-related env var names (SUPABASE from
+            # database/supabase) in the full-auth template
+            db_env_vars = _DB_ENV_VAR_RE.findall(full_ci_text)
+
+            for var in set(db_env_vars):
+                if var not in noauth_ci_text:
+                    error(
+                        f"[35] {sf}: No-Auth CI Job Template missing database "
+                        f"env var '{var}' which is present in full-auth CI "
+                        f"Job Template (should be commented or uncommented)"
+                    )
+
+
+for sf, content in stack_contents.items():
+    check_stack_sections(sf, content)
 
 # ---------------------------------------------------------------------------
 # Check 18: Change Skill Validates Payment Requires Database
 # ---------------------------------------------------------------------------
 
 change_path_db = ".claude/commands/change.md"
-if os.path.isfile(change_path_db):
-    with open(change_path_db) as f:
-        change_content_db = f.read()
-    change_prose_db = extract_prose(change_content_db)
+change_content_db = skill_contents.get(change_path_db)
+if change_content_db is not None:
 
     # Check if change.md has a payment section in Feature constraints
-    feature_constraints_match = re.search(
-        r"(?i)####?\s+Feature constraints\s*\n(.*?)(?=\n####?\s|\Z)",
-        change_content_db,
-        re.DOTALL,
+    feature_constraints_match = _FEATURE_CONSTRAINTS_RE.search(
+        skill_lc[change_path_db]
     )
     if feature_constraints_match:
         feature_section = feature_constraints_match.group(1)
-        has_db_check = bool(
-            re.search(
-                r"(?i)payment.*database.*present|database.*present.*payment|"
-                r"payment\s+requires.*database|"
-                r"stack\.database.*(?:missing|present|also)|"
-                r"both.*stack\.auth.*stack\.database",
-                feature_section,
-            )
-        )
+        has_db_check = _any_line_probe(feature_section, _CHANGE_PAYMENT_DB_PROBES)
         if not has_db_check:
             error(
                 f"[18] {change_path_db}: Feature constraints section "
@@ -942,39 +1526,30 @@ if os.path.isfile(change_path_db):
 # Check 19: Fixture Coverage for Testing with Partial Assumes
 # ---------------------------------------------------------------------------
 
-if os.path.isdir(fixture_dir):
-    fixture_files_testing = sorted(glob.glob(os.path.join(fixture_dir, "*.yaml")))
-
-    # Collect fixture stack configs for testing fixtures only
-    testing_fixtures_all_met: list[str] = []
-    testing_fixtures_none_met: list[str] = []
-    testing_fixtures_partial_met: list[str] = []
+if has_fixture_dir:
+    # The check only needs to know whether each coverage scenario exists —
+    # and can stop early, since one partial-met fixture settles it
+    has_all_met = False
+    has_none_met = False
+    has_partial_met = False
 
     # Get testing stack file assumes
     testing_assumes_categories: set[str] = set()
-    for sf in stack_files:
-        if "/testing/" in sf:
-            fm_t = parse_frontmatter(sf)
-            if fm_t:
-                for a in fm_t.get("assumes", []) or []:
-                    testing_assumes_categories.add(a.split("/")[0])
+    for sf in testing_stack_files:
+        meta_t = stack_meta.get(sf)
+        if meta_t:
+            for a in meta_t.assumes:
+                testing_assumes_categories.add(a.split("/")[0])
 
     # Only run check if we have testing assumes to validate against
     if testing_assumes_categories:
         optional_testing_assumes = testing_assumes_categories & OPTIONAL_CATEGORIES
 
-        for ff in fixture_files_testing:
-            with open(ff) as f:
-                try:
-                    fixture = yaml.safe_load(f)
-                except yaml.YAMLError:
-                    continue
-            if not isinstance(fixture, dict):
-                continue
-            idea = fixture.get("idea", {})
-            stack = idea.get("stack", {})
-            if not isinstance(stack, dict):
+        for ff in fixture_files:
+            view = fixture_views.get(ff)
+            if view is None or view.stack is None:
                 continue
+            stack = view.stack
 
             # Only consider fixtures with testing
             if "testing" not in stack:
@@ -987,13 +1562,15 @@ if os.path.isdir(fixture_dir):
             }
 
             if met == optional_testing_assumes:
-                testing_fixtures_all_met.append(ff)
+                has_all_met = True
             elif not met:
-                testing_fixtures_none_met.append(ff)
+                has_none_met = True
             else:
-                testing_fixtures_partial_met.append(ff)
+                # A partial-met fixture means the check can never fire
+                has_partial_met = True
+                break
 
-        if testing_fixtures_all_met and testing_fixtures_none_met and not testing_fixtures_partial_met:
+        if has_all_met and has_none_met and not has_partial_met:
             error(
                 f"[19] tests/fixtures/: testing fixtures only cover "
                 f"all-met and none-met assumes scenarios without at least "
@@ -1005,21 +1582,19 @@ if os.path.isdir(fixture_dir):
 # ---------------------------------------------------------------------------
 
 if os.path.isfile(makefile_path):
-    with open(makefile_path) as f:
-        makefile_content_help = f.read()
-
     # Parse target help comments: lines matching "target-name: ## help text"
-    for m in re.finditer(r"^([a-zA-Z0-9_-]+):\s*.*?##\s*(.+)$", makefile_content_help, re.MULTILINE):
+    for m in _MK_HELP_RE.finditer(makefile_content):
         target_name_20 = m.group(1)
         help_text = m.group(2)
 
-        # Look for environment variable names in help text
-        env_vars_in_help = re.findall(
-            r"\b(?:NEXT_PUBLIC_[A-Z_]+|[A-Z][A-Z_]{3,}(?:_KEY|_URL|_ID|_SECRET|_TOKEN|_ANON_KEY|_ROLE_KEY))\b",
-            help_text,
-        )
+        # Look for environment variable names in help text — literal hint
+        # scan first, regex only on lines that could contain one
+        if any(h in help_text for h in _ENV_VAR_HINTS):
+            env_vars_in_help = _HELP_ENV_VAR_RE.findall(help_text)
+        else:
+            env_vars_in_help = []
         if env_vars_in_help:
-            line_num = makefile_content_help[: m.start()].count("\n") + 1
+            line_num = line_of(makefile_content, m.start())
             error(
                 f"[20] Makefile:{line_num}: target '{target_name_20}' help "
                 f"text contains environment variable name(s) "
@@ -1027,83 +1602,23 @@ if os.path.isfile(makefile_path):
             )
 
 # ---------------------------------------------------------------------------
-# Check 21: Stack File Packages in Prose Match Frontmatter Declarations
-# ---------------------------------------------------------------------------
-
-# Similar to Check 17 (env vars sync), but for packages.
-# Look for "npm install <pkg>" in Packages prose sections and verify those
-# packages appear in frontmatter packages.runtime or packages.dev.
-
-PACKAGE_INSTALL_LINE_PATTERN = re.compile(
-    r"^npm install\s+(.+)$", re.MULTILINE
-)
-
-for sf, content in stack_contents.items():
-    fm = parse_frontmatter(sf)
-    if not fm:
-        continue
-
-    pkg_section = fm.get("packages", {}) or {}
-    fm_runtime = set(pkg_section.get("runtime", []) or [])
-    fm_dev = set(pkg_section.get("dev", []) or [])
-    fm_all_packages = fm_runtime | fm_dev
-
-    # Find "Packages" section in prose (## Packages)
-    pkg_section_match = re.search(
-        r"##\s+Packages\s*\n(.*?)(?=\n##\s|\Z)",
-        content,
-        re.DOTALL,
-    )
-    if not pkg_section_match:
-        continue
-
-    pkg_prose = pkg_section_match.group(1)
-
-    # Extract package names from "npm install ..." commands in code blocks
-    # within the Packages section
-    code_blocks_in_section = re.findall(
-        r"```(?:bash|sh)\s*\n(.*?)```", pkg_prose, re.DOTALL
-    )
-    prose_packages: set[str] = set()
-    for code_block in code_blocks_in_section:
-        for m in PACKAGE_INSTALL_LINE_PATTERN.finditer(code_block):
-            tokens = m.group(1).strip().split()
-            # Filter out flags (e.g., -D, --save-dev) and keep only package names
-            pkgs = [t for t in tokens if not t.startswith("-")]
-            prose_packages.update(pkgs)
-
-    for pkg in sorted(prose_packages - fm_all_packages):
-        line_num = content[: pkg_section_match.start()].count("\n") + 1
-        error(
-            f"[21] {sf}:{line_num}: Packages prose contains 'npm install {pkg}' "
-            f"but '{pkg}' is not in frontmatter packages.runtime or packages.dev"
-        )
-
+# Check 21 runs in the fused section-based pass above.
 # ---------------------------------------------------------------------------
 # Check 22: Bootstrap Payment-Database Dependency
 # ---------------------------------------------------------------------------
 
 bootstrap_path_22 = ".claude/commands/bootstrap.md"
-if os.path.isfile(bootstrap_path_22):
-    with open(bootstrap_path_22) as f:
-        bootstrap_content_22 = f.read()
+bootstrap_content_22 = skill_contents.get(bootstrap_path_22)
+if bootstrap_content_22 is not None:
 
     # Find the Phase 1 Step 3 validation section (a numbered list item: "3. **Validate idea.yaml**")
-    validate_section_match = re.search(
-        r"(?i)(?:###?\s*|\d+\.\s*(?:\*\*)?)Validate idea\.yaml(?:\*\*)?\s*\n(.*?)(?=\n\d+\.\s*\*\*|\n###?\s|\n##\s|\Z)",
-        bootstrap_content_22,
-        re.DOTALL,
+    validate_section_match = _BOOTSTRAP_VALIDATE_SECTION_RE.search(
+        skill_lc[bootstrap_path_22]
     )
     if validate_section_match:
         validate_section = validate_section_match.group(1)
-        has_db_check = bool(
-            re.search(
-                r"(?i)payment.*database.*present|database.*present.*payment|"
-                r"payment\s+requires.*database|"
-                r"stack\.database.*(?:missing|present|also)|"
-                r"stack\.payment.*(?:verify|check).*stack\.database",
-                validate_section,
-            )
+        has_db_check = _any_line_probe(
+            validate_section, _BOOTSTRAP_PAYMENT_DB_PROBES
         )
         if not has_db_check:
             error(
@@ -1123,85 +1638,44 @@ if os.path.isfile(bootstrap_path_22):
 
 ci_yml_path_23 = ".github/workflows/ci.yml"
 if os.path.isfile(ci_yml_path_23):
-    with open(ci_yml_path_23) as f:
-        ci_content_23 = f.read()
+    ci_content_23 = _read(ci_yml_path_23)
 
     # Check if ci.yml e2e job contains Stripe env vars
-    e2e_match = re.search(
-        r"e2e:.*?(?=\n  \w+:|\Z)", ci_content_23, re.DOTALL
-    )
+    e2e_match = _CI_E2E_RE.search(ci_content_23)
     if e2e_match:
         e2e_section = e2e_match.group(0)
-        stripe_vars_in_ci = re.findall(
-            r"(STRIPE_\w+|NEXT_PUBLIC_STRIPE_\w+)", e2e_section
-        )
+        stripe_vars_in_ci = _STRIPE_VAR_RE.findall(e2e_section)
 
         if stripe_vars_in_ci:
-            # Check that testing stack CI template also mentions them
-            for sf, content in stack_contents.items():
-                if "/testing/" not in sf:
-                    continue
-                ci_template_match = re.search(
-                    r"## CI Job Template\s*\n(.*?)(?=\n## |\Z)",
-                    content,
-                    re.DOTALL,
-                )
-                if ci_template_match:
-                    ci_template = ci_template_match.group(1)
+            # Check that testing stack CI template also mentions them —
+            # set membership on the tokenized template is the fast path; the
+            # substring scan only runs for vars not found as exact tokens
+            # (a var from ci.yml may be a suffix of a longer template token)
+            for sf in testing_stack_files:
+                ci_template_entry = stack_sections[sf].get("CI Job Template")
+                if ci_template_entry:
+                    ci_template = ci_template_entry[0]
+                    ci_tokens = set(_CI_TOKEN_RE.findall(ci_template))
                     for var in stripe_vars_in_ci:
-                        if var not in ci_template:
+                        if var not in ci_tokens and var not in ci_template:
                             error(
                                 f"[23] {sf}: CI Job Template missing '{var}' "
                                 f"which is present in ci.yml e2e job"
                             )
 
 # ---------------------------------------------------------------------------
-# Check 24: Testing Stack No-Auth Fallback Includes CI Job Template
-# ---------------------------------------------------------------------------
-
-for sf, content in stack_contents.items():
-    if "/testing/" not in sf:
-        continue
-    fm = parse_frontmatter(sf)
-    if not fm:
-        continue
-
-    # Check for No-Auth Fallback section
-    fallback_match = re.search(
-        r"## No-Auth Fallback\s*\n(.*?)(?=\n## [^#]|\Z)",
-        content,
-        re.DOTALL,
-    )
-    if fallback_match:
-        fallback_section = fallback_match.group(1)
-        # Check for a YAML code block with an e2e: job definition
-        yaml_blocks = re.findall(
-            r"```yaml\s*\n(.*?)```", fallback_section, re.DOTALL
-        )
-        has_e2e_job = any("e2e:" in block for block in yaml_blocks)
-        if not has_e2e_job:
-            error(
-                f"[24] {sf}: No-Auth Fallback section missing a CI job "
-                f"template (YAML code block with 'e2e:' job definition)"
-            )
-
+# Check 24 runs in the fused section-based pass above.
 # ---------------------------------------------------------------------------
 # Check 25: Change Skill Test Type Permits Adding Testing to idea.yaml Stack
 # ---------------------------------------------------------------------------
 
 change_path_25 = ".claude/commands/change.md"
-if os.path.isfile(change_path_25):
-    with open(change_path_25) as f:
-        change_content_25 = f.read()
+change_content_25 = skill_contents.get(change_path_25)
+if change_content_25 is not None:
 
     # Look for text indicating the Test type can add testing to idea.yaml stack
     has_testing_addition = bool(
-        re.search(
-            r"(?i)(?:test.*(?:add|update).*(?:idea\.yaml|stack).*testing|"
-            r"testing.*(?:idea\.yaml|stack)|"
-            r"stack\.testing.*idea\.yaml)",
-            change_content_25,
-        )
+        _CHANGE_TESTING_RE.search(skill_lc[change_path_25])
     )
     if not has_testing_addition:
         error(
@@ -1210,120 +1684,24 @@ if os.path.isfile(change_path_25):
         )
 
 # ---------------------------------------------------------------------------
-# Check 26: Testing Stack Env Frontmatter Excludes Assumes-Dependent Vars
-# ---------------------------------------------------------------------------
-
-for sf in stack_files:
-    if "/testing/" not in sf:
-        continue
-    fm = parse_frontmatter(sf)
-    if not fm:
-        continue
-
-    assumes = fm.get("assumes", []) or []
-    optional_assumes = [
-        a for a in assumes
-        if a.split("/")[0] in OPTIONAL_CATEGORIES
-    ]
-    if not optional_assumes:
-        continue
-
-    # Check if there's a fallback section (meaning assumes are truly optional)
-    content = stack_contents.get(sf, "")
-    has_fallback = bool(
-        re.search(r"(?i)fallback|no[- ]auth", content)
-    )
-    if not has_fallback:
-        continue
-
-    # Get provider names from optional assumes
-    provider_names = set()
-    for a in optional_assumes:
-        provider_names.add(a.split("/")[1].upper())
-
-    env_section = fm.get("env", {}) or {}
-    server_vars = env_section.get("server", []) or []
-    client_vars = env_section.get("client", []) or []
-    all_env = server_vars + client_vars
-
-    for var in all_env:
-        for provider in provider_names:
-            if provider in var:
-                error(
-                    f"[26] {sf}: env frontmatter var '{var}' contains "
-                    f"provider name '{provider}' from optional assumes — "
-                    f"should not be unconditional when a fallback exists"
-                )
-
-# ---------------------------------------------------------------------------
-# Check 27: Auth Template Post-Auth Redirects
-# ---------------------------------------------------------------------------
-
-for sf, content in stack_contents.items():
-    if "/auth/" not in sf:
-        continue
-
-    blocks = extract_code_blocks(content, {"tsx", "jsx"})
-    for block in blocks:
-        code = block["code"]
-        # Check if this is a signup or login page template
-        is_signup = "signUp" in code or "handleSignup" in code
-        is_login = "signInWithPassword" in code or "handleLogin" in code
-        if not is_signup and not is_login:
-            continue
-
-        page_type = "signup" if is_signup else "login"
-
-        # Check for a redirect call after the auth success path
-        has_redirect = bool(
-            re.search(r"router\.push\(|router\.replace\(|redirect\(", code)
-        )
-        has_only_todo = bool(
-            re.search(r"//\s*TODO.*redirect", code, re.IGNORECASE)
-        )
-
-        if not has_redirect or has_only_todo:
-            error(
-                f"[27] {sf}:{block['start_line']}: {page_type} page template "
-                f"has no post-auth redirect (router.push/redirect) — only a "
-                f"TODO comment"
-                if has_only_todo
-                else f"[27] {sf}:{block['start_line']}: {page_type} page "
-                f"template missing post-auth redirect (router.push/redirect)"
-            )
-
+# Checks 26 and 27 run in the fused section-based pass above.
 # ---------------------------------------------------------------------------
 # Check 28: Change Assumes Validation Matches Bootstrap Assumes Validation
 # ---------------------------------------------------------------------------
 
 change_path_28 = ".claude/commands/change.md"
 bootstrap_path_28 = ".claude/commands/bootstrap.md"
-if os.path.isfile(change_path_28) and os.path.isfile(bootstrap_path_28):
-    with open(change_path_28) as f:
-        change_content_28 = f.read()
+change_content_28 = skill_contents.get(change_path_28)
+if change_content_28 is not None and bootstrap_path_28 in skill_contents:
 
     # Find assumes validation text in change.md
-    assumes_refs = list(
-        re.finditer(r"(?i)assumes.*list", change_content_28)
-    )
+    change_lc_28 = skill_lc[change_path_28]
+    assumes_refs = list(_ASSUMES_LIST_RE.finditer(change_lc_28))
     if assumes_refs:
         # Check if the change skill's assumes validation includes
         # value-matching language (not just category existence)
-        change_assumes_text = change_content_28
-        has_value_matching = bool(
-            re.search(
-                r"(?i)category[/:]value|value\s+(?:must\s+)?match|"
-                r"matching\s+.*pair|category:\s*value.*pair|"
-                r"not just.*(?:category|present)",
-                change_assumes_text,
-            )
-        )
-        has_category_only = bool(
-            re.search(
-                r"(?i)check if the corresponding stack category exists",
-                change_assumes_text,
-            )
-        )
+        has_value_matching = bool(_VALUE_MATCH_RE.search(change_lc_28))
+        has_category_only = _CATEGORY_ONLY_PROBE in change_lc_28
         if has_category_only and not has_value_matching:
             error(
                 f"[28] {change_path_28}: assumes validation uses "
@@ -1336,23 +1714,15 @@ if os.path.isfile(change_path_28) and os.path.isfile(bootstrap_path_28):
 # ---------------------------------------------------------------------------
 
 change_path_29 = ".claude/commands/change.md"
-if os.path.isfile(change_path_29):
-    with open(change_path_29) as f:
-        change_content_29 = f.read()
+change_content_29 = skill_contents.get(change_path_29)
+if change_content_29 is not None:
 
     # Find payment dependency validation text (the stop messages)
-    payment_validation_pattern = re.compile(
-        r"Payment requires (?:authentication|a database)",
-        re.IGNORECASE,
-    )
-    payment_matches = list(payment_validation_pattern.finditer(change_content_29))
+    payment_matches = list(_PAYMENT_STOP_RE.finditer(skill_lc[change_path_29]))
 
     if payment_matches:
         # Find the plan phase marker
-        plan_phase_match = re.search(
-            r"## Phase 1|### STOP",
-            change_content_29,
-        )
+        plan_phase_match = _PLAN_PHASE_RE.search(change_content_29)
         if plan_phase_match:
             plan_phase_pos = plan_phase_match.start()
             # At least one payment validation instance must appear before plan phase
@@ -1367,51 +1737,24 @@ if os.path.isfile(change_path_29):
                 )
 
 # ---------------------------------------------------------------------------
-# Check 30: Analytics Stack Files Include Dashboard Navigation Section
-# ---------------------------------------------------------------------------
-
-analytics_stack_files = [
-    sf for sf in stack_files if "/analytics/" in sf
-]
-
-for sf in analytics_stack_files:
-    content = stack_contents[sf]
-    has_dashboard_nav = bool(
-        re.search(r"(?i)^## Dashboard Navigation", content, re.MULTILINE)
-    )
-    if not has_dashboard_nav:
-        error(
-            f"[30] {sf}: analytics stack file missing required "
-            f"'## Dashboard Navigation' section (needed by /iterate skill)"
-        )
-
+# Check 30 runs in the fused section-based pass above.
 # ---------------------------------------------------------------------------
 # Check 31: Change Skill Revalidates Testing Assumes for All Change Types
 # ---------------------------------------------------------------------------
 
 change_path_31 = ".claude/commands/change.md"
-if os.path.isfile(change_path_31):
-    with open(change_path_31) as f:
-        change_content_31 = f.read()
+change_content_31 = skill_contents.get(change_path_31)
+if change_content_31 is not None:
 
     # Find preconditions section (by content, not step number)
-    preconditions_match = re.search(
-        r"## Step \d+:.*?[Cc]heck preconditions.*?\n(.*?)(?=\n## Step \d|\n## Phase|\Z)",
-        change_content_31,
-        re.DOTALL,
-    )
+    preconditions_match = _CHANGE_PRECONDITIONS_RE.search(change_content_31)
     if preconditions_match:
         preconditions_text = preconditions_match.group(1)
 
         # Look for testing assumes validation NOT gated by Test-type classification
         # There should be a check that runs when type is NOT Test
         has_non_test_assumes_check = bool(
-            re.search(
-                r"(?i)(?:NOT\s+Test|type\s+is\s+NOT\s+Test).*testing.*assumes|"
-                r"testing.*assumes.*(?:NOT\s+Test|type\s+is\s+NOT\s+Test)",
-                preconditions_text,
-                re.DOTALL,
-            )
+            _NON_TEST_ASSUMES_RE.search(preconditions_text.lower())
         )
         if not has_non_test_assumes_check:
             error(
@@ -1425,21 +1768,7 @@ if os.path.isfile(change_path_31):
         )
 
 # ---------------------------------------------------------------------------
-# Check 32: Analytics Stack Files Include Test Blocking Section
-# ---------------------------------------------------------------------------
-
-for sf in analytics_stack_files:
-    content = stack_contents[sf]
-    has_test_blocking = bool(
-        re.search(r"(?i)^## Test Blocking", content, re.MULTILINE)
-    )
-    if not has_test_blocking:
-        error(
-            f"[32] {sf}: analytics stack file missing required "
-            f"'## Test Blocking' section (needed by testing stack's "
-            f"blockAnalytics helper)"
-        )
-
+# Check 32 runs in the fused section-based pass above.
 # ---------------------------------------------------------------------------
 # Check 33: Skill Prose Phantom Event Names
 # ---------------------------------------------------------------------------
@@ -1451,7 +1780,7 @@ for sf in analytics_stack_files:
 events_yaml_path = "EVENTS.yaml"
 if os.path.isfile(events_yaml_path):
     with open(events_yaml_path) as f:
-        events_data = yaml.safe_load(f) or {}
+        events_data = yaml.load(f, Loader=SafeLoader) or {}
 
     # Collect all defined event names from EVENTS.yaml
     defined_events: set[str] = set()
@@ -1472,7 +1801,7 @@ if os.path.isfile(events_yaml_path):
                     event_props.add(prop_name)
 
     for sf, content in skill_contents.items():
-        prose = extract_prose(content)
+        prose = skill_prose[sf]
 
         # Collect event names and property names defined in YAML code blocks
         # within this skill (events the skill adds to EVENTS.yaml at runtime)
@@ -1480,7 +1809,7 @@ if os.path.isfile(events_yaml_path):
         skill_defined_props: set[str] = set()
         for yblock in extract_code_blocks(content, {"yaml"}):
             try:
-                ydata = yaml.safe_load(yblock["code"])
+                ydata = yaml.load(yblock["code"], Loader=SafeLoader)
             except yaml.YAMLError:
                 continue
             # Collect event dicts from various structures:
@@ -1507,7 +1836,7 @@ if os.path.isfile(events_yaml_path):
                         skill_defined_props.add(prop_name)
 
         # Find backtick-wrapped snake_case tokens near event/fire context
-        for m in re.finditer(r"`([a-z][a-z0-9_]+)`", prose):
+        for m in _BACKTICK_TOKEN_RE.finditer(prose):
             token = m.group(1)
             # Only check if it looks like an event name (snake_case, not a file path)
             if "/" in token or "." in token:
@@ -1516,7 +1845,7 @@ if os.path.isfile(events_yaml_path):
             start = max(0, m.start() - 100)
             end = min(len(prose), m.end() + 100)
             context = prose[start:end].lower()
-            if not re.search(r"\bevent\b|\bfire\b", context):
+            if not _EVENT_CONTEXT_RE.search(context):
                 continue
             # Skip known event names
             if token in defined_events:
@@ -1533,10 +1862,10 @@ if os.path.isfile(events_yaml_path):
                 continue
             # Skip if preceded by "from EVENTS.yaml" or "in EVENTS.yaml" within 100 chars
             context_before = prose[start:m.start()].lower()
-            if re.search(r"(?:from|in)\s+events\.yaml", context_before):
+            if _FROM_EVENTS_RE.search(context_before):
                 continue
             # Skip generic references like "EVENTS.yaml event(s)" or "its events"
-            if re.search(r"events\.yaml", context.lower()):
+            if "events.yaml" in context:
                 continue
             # Skip known non-event tokens (stack categories, types, idea.yaml fields, etc.)
             skip_tokens = {
@@ -1552,7 +1881,7 @@ if os.path.isfile(events_yaml_path):
             if token in skip_tokens:
                 continue
             pos = content.find(f"`{token}`")
-            line_num = content[:pos].count("\n") + 1 if pos >= 0 else "?"
+            line_num = line_of(content, pos) if pos >= 0 else "?"
             error(
                 f"[33] {sf}:{line_num}: prose references event name "
                 f"'{token}' near event/fire context, but it is not "
@@ -1560,104 +1889,7 @@ if os.path.isfile(events_yaml_path):
             )
 
 # ---------------------------------------------------------------------------
-# Check 34: Stack Files with Fallback Sections Annotate Conditional Files
-# ---------------------------------------------------------------------------
-
-for sf, content in stack_contents.items():
-    fm = parse_frontmatter(sf)
-    if not fm:
-        continue
-
-    # Check if this stack file has a fallback section
-    has_fallback = bool(
-        re.search(r"(?i)## No-Auth Fallback|## .*Fallback", content)
-    )
-    if not has_fallback:
-        continue
-
-    fm_files = fm.get("files", []) or []
-    if not fm_files:
-        continue
-
-    # Get the files line from frontmatter to check for # conditional comment
-    fm_match = re.match(r"^---\n(.*?\n)---", content, re.DOTALL)
-    if not fm_match:
-        continue
-    fm_text = fm_match.group(1)
-    files_line_match = re.search(r"^files:.*$", fm_text, re.MULTILINE)
-    if not files_line_match:
-        continue
-    files_line = files_line_match.group(0)
-
-    # Find code block headers that only appear outside the fallback section
-    fallback_start = re.search(r"(?i)## No-Auth Fallback|## .*Fallback", content)
-    if not fallback_start:
-        continue
-
-    # Get headers before fallback
-    pre_fallback = content[:fallback_start.start()]
-    post_fallback = content[fallback_start.start():]
-
-    pre_headers = set(re.findall(r"###\s+`([^`]+)`", pre_fallback))
-    post_headers = set(re.findall(r"###\s+`([^`]+)`", post_fallback))
-
-    # Files whose headers only appear in pre-fallback (full template only)
-    full_only_headers = pre_headers - post_headers
-
-    # Check if any frontmatter files match full-only headers
-    assumes_dependent_files = [f for f in fm_files if f in full_only_headers]
-
-    if assumes_dependent_files and "# conditional" not in files_line:
-        error(
-            f"[34] {sf}: files frontmatter lists assumes-dependent files "
-            f"{assumes_dependent_files} but lacks '# conditional' annotation"
-        )
-
-# ---------------------------------------------------------------------------
-# Check 35: No-Auth CI Template Includes Commented Database Placeholder Env Vars
-# ---------------------------------------------------------------------------
-
-for sf, content in stack_contents.items():
-    if "/testing/" not in sf:
-        continue
-
-    # Find the full-auth CI Job Template
-    full_ci_match = re.search(
-        r"## CI Job Template\s*\n(.*?)(?=\n## |\Z)",
-        content,
-        re.DOTALL,
-    )
-    if not full_ci_match:
-        continue
-
-    # Find the No-Auth CI Job Template
-    noauth_ci_match = re.search(
-        r"### No-Auth CI Job Template\s*\n(.*?)(?=\n### |\n## |\Z)",
-        content,
-        re.DOTALL,
-    )
-    if not noauth_ci_match:
-        continue
-
-    full_ci_text = full_ci_match.group(1)
-    noauth_ci_text = noauth_ci_match.group(1)
-
-    # Check for database-related env var names (SUPABASE from database/supabase)
-    # in the full-auth template
-    db_env_vars = re.findall(
-        r"(NEXT_PUBLIC_SUPABASE_URL|NEXT_PUBLIC_SUPABASE_ANON_KEY)",
-        full_ci_text,
-    )
-
-    if db_env_vars:
-        for var in set(db_env_vars):
-            if var not in noauth_ci_text:
-                error(
-                    f"[35] {sf}: No-Auth CI Job Template missing database "
-                    f"env var '{var}' which is present in full-auth CI "
-                    f"Job Template (should be commented or uncommented)"
-                )
-
+# Checks 34 and 35 run in the fused section-based pass above.
 # ---------------------------------------------------------------------------
 # Check 36: (removed — bootstrap now supports stack.testing)
 # ---------------------------------------------------------------------------
@@ -1667,27 +1899,18 @@ for sf, content in stack_contents.items():
 # ---------------------------------------------------------------------------
 
 change_path_37 = ".claude/commands/change.md"
-if os.path.isfile(change_path_37):
-    with open(change_path_37) as f:
-        change_content_37 = f.read()
+change_content_37 = skill_contents.get(change_path_37)
+if change_content_37 is not None:
 
     # Find the step heading containing "Classify"
-    classify_match = re.search(
-        r"^## Step (\d+):.*(?:Classify|classify)",
-        change_content_37,
-        re.MULTILINE,
-    )
+    classify_match = _CLASSIFY_STEP_RE.search(change_content_37)
 
     # Find step headings whose body contains "classified as" or "is a Fix"
-    step_pattern = re.compile(
-        r"^## Step (\d+):.*\n(.*?)(?=^## Step \d|\Z)",
-        re.MULTILINE | re.DOTALL,
-    )
     classification_dependent_steps: list[tuple[int, str]] = []
-    for m in step_pattern.finditer(change_content_37):
+    for m in _STEP_RE.finditer(change_content_37):
         step_num = int(m.group(1))
         body = m.group(2)
-        if re.search(r"classified as|is classified as|is a Fix|is NOT Test", body):
+        if _CLASSIFICATION_DEP_RE.search(body):
             classification_dependent_steps.append((step_num, body[:50]))
 
     if classify_match and classification_dependent_steps:
@@ -1708,7 +1931,7 @@ ads_yaml_path = "idea/ads.yaml"
 if os.path.isfile(ads_yaml_path):
     with open(ads_yaml_path) as f:
         try:
-            ads_data = yaml.safe_load(f)
+            ads_data = yaml.load(f, Loader=SafeLoader)
         except yaml.YAMLError as e:
             error(f"[38] {ads_yaml_path}: invalid YAML: {e}")
             ads_data = None
@@ -1829,12 +2052,12 @@ if os.path.isfile(ads_yaml_path):
 
 if os.path.isfile(ads_yaml_path) and os.path.isfile("idea/idea.yaml"):
     with open("idea/idea.yaml") as f:
-        idea_data_39 = yaml.safe_load(f)
+        idea_data_39 = yaml.load(f, Loader=SafeLoader)
 
     if os.path.isfile(ads_yaml_path):
         with open(ads_yaml_path) as f:
             try:
-                ads_data_39 = yaml.safe_load(f)
+                ads_data_39 = yaml.load(f, Loader=SafeLoader)
             except yaml.YAMLError:
                 ads_data_39 = None
 
@@ -1861,9 +2084,8 @@ if os.path.isfile(ads_yaml_path) and os.path.isfile("idea/idea.yaml"):
 # Verify that distribute.md contains the event definition in a code block
 # (so it can be added during Step 7c).
 distribute_path = ".claude/commands/distribute.md"
-if os.path.isfile(distribute_path):
-    with open(distribute_path) as f:
-        distribute_content = f.read()
+distribute_content = skill_contents.get(distribute_path)
+if distribute_content is not None:
 
     # distribute.md must contain a YAML code block that defines feedback_submitted
     yaml_blocks = extract_code_blocks(distribute_content, {"yaml"})
@@ -1883,12 +2105,11 @@ if os.path.isfile(distribute_path):
 # ---------------------------------------------------------------------------
 
 distribute_path_41 = ".claude/commands/distribute.md"
-if os.path.isfile(distribute_path_41):
-    with open(distribute_path_41) as f:
-        distribute_content_41 = f.read()
+distribute_content_41 = skill_contents.get(distribute_path_41)
+if distribute_content_41 is not None:
 
     # Check if distribute.md references docs/google-ads-setup.md
-    docs_ref_match = re.search(r"`(docs/google-ads-setup\.md)`", distribute_content_41)
+    docs_ref_match = _DOCS_REF_RE.search(distribute_content_41)
     if docs_ref_match:
         referenced_path = docs_ref_match.group(1)
         if not os.path.isfile(referenced_path):
@@ -1902,26 +2123,16 @@ if os.path.isfile(distribute_path_41):
 # ---------------------------------------------------------------------------
 
 distribute_path_42 = ".claude/commands/distribute.md"
-if os.path.isfile(distribute_path_42):
-    with open(distribute_path_42) as f:
-        distribute_content_42 = f.read()
+distribute_content_42 = skill_contents.get(distribute_path_42)
+if distribute_content_42 is not None:
 
     # Find preconditions section (between "Step 1" and "Step 2" headings)
-    preconditions_match_42 = re.search(
-        r"## Step 1:.*?\n(.*?)(?=\n## Step 2:|\Z)",
-        distribute_content_42,
-        re.DOTALL,
-    )
+    preconditions_match_42 = _DISTRIBUTE_STEP1_RE.search(distribute_content_42)
     if preconditions_match_42:
         preconditions_text_42 = preconditions_match_42.group(1)
         # Check for a stop message mentioning analytics being required
         has_analytics_validation = bool(
-            re.search(
-                r"(?i)analytics.*(?:required|not present|not configured).*stop|"
-                r"stack\.analytics.*(?:present|not|missing)|"
-                r"(?:verify|check).*stack\.analytics",
-                preconditions_text_42,
-            )
+            _ANALYTICS_VALIDATION_RE.search(preconditions_text_42)
         )
         if not has_analytics_validation:
             error(
@@ -1940,45 +2151,30 @@ if os.path.isfile(distribute_path_42):
 # ---------------------------------------------------------------------------
 
 distribute_path_43 = ".claude/commands/distribute.md"
-if os.path.isfile(distribute_path_43):
-    with open(distribute_path_43) as f:
-        distribute_content_43 = f.read()
+distribute_content_43 = skill_contents.get(distribute_path_43)
+if distribute_content_43 is not None:
 
     # Find preconditions section (between "Step 1" and "Step 2" headings)
-    preconditions_match_43 = re.search(
-        r"## Step 1:.*?\n(.*?)(?=\n## Step 2:|\Z)",
-        distribute_content_43,
-        re.DOTALL,
-    )
+    preconditions_match_43 = _DISTRIBUTE_STEP1_RE.search(distribute_content_43)
     if preconditions_match_43:
         preconditions_text_43 = preconditions_match_43.group(1)
         # Check for custom_events validation near stop/list/malformed/missing context
-        has_custom_events_validation = bool(
-            re.search(
-                r"custom_events",
-                preconditions_text_43,
-            )
-        )
-        if has_custom_events_validation:
+        ce_pos = preconditions_text_43.find("custom_events")
+        if ce_pos >= 0:
             # Verify it's near a validation/stop context (within 200 chars)
-            ce_match = re.search(r"custom_events", preconditions_text_43)
-            if ce_match:
-                start = max(0, ce_match.start() - 200)
-                end = min(len(preconditions_text_43), ce_match.end() + 200)
-                context = preconditions_text_43[start:end]
-                has_validation_context = bool(
-                    re.search(
-                        r"(?i)stop|list|malformed|missing",
-                        context,
-                    )
+            start = max(0, ce_pos - 200)
+            end = min(
+                len(preconditions_text_43), ce_pos + len("custom_events") + 200
+            )
+            context = preconditions_text_43[start:end]
+            has_validation_context = bool(_VALIDATION_CONTEXT_RE.search(context))
+            if not has_validation_context:
+                error(
+                    f"[43] {distribute_path_43}: preconditions mention "
+                    f"`custom_events` but not near a stop/validation "
+                    f"context (expected 'stop', 'list', 'malformed', or "
+                    f"'missing' within 200 chars)"
                 )
-                if not has_validation_context:
-                    error(
-                        f"[43] {distribute_path_43}: preconditions mention "
-                        f"`custom_events` but not near a stop/validation "
-                        f"context (expected 'stop', 'list', 'malformed', or "
-                        f"'missing' within 200 chars)"
-                    )
         else:
             error(
                 f"[43] {distribute_path_43}: preconditions section does not "
@@ -1995,6 +2191,7 @@ if os.path.isfile(distribute_path_43):
 # Summary
 # ---------------------------------------------------------------------------
 
+_flush_errors()
 print()
 if ERRORS:
     print(f"FAILED: {len(ERRORS)} error(s)")